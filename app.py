@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 import streamlit as st
 from dotenv import load_dotenv
 
@@ -9,13 +10,36 @@ sys.path.append(os.path.abspath("."))
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-from utils.resume_parser import extract_resume_text
-from utils.jd_parser import clean_job_description
-from utils.keyword_extractor import extract_keywords
-from utils.match_scorer import compute_match_score
-from utils.gpt_feedback import get_gpt_suggestions, get_chat_response
+from utils.resume_parser import PDFExtractionError
+from utils.cache import cached_resume_text, get_cache
+from utils.incremental import IncrementalMatcher
+from utils.match_scorer import compute_skill_match
+from utils.semantic_matcher import compute_semantic_match_score
+from utils.gpt_feedback import CHAT_SYSTEM_PROMPT, stream_gpt_suggestions, stream_chat_response
+from utils.chat_context import ChatContext, resume_facts
+from utils.llm_client import get_latency_stats, prefetch_stream
+from utils.llm_cache import get_llm_cache
+from utils.prompt_builder import get_compression_stats
 from utils.ats_checker import run_ats_checks
-from utils.display_helpers import display_score, display_missing_keywords
+from utils.display_helpers import display_score, display_missing_keywords, display_streamed_text
+from utils import telemetry, warm_up
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_up_once():
+    # Once per server process, after the first page has rendered: loads the spaCy
+    # model on a background thread so the first analysis doesn't pay for it.
+    # Set WARM_UP_MODELS=0 to load it on first use instead.
+    threading.Thread(
+        target=warm_up, kwargs=dict(spacy_model=True, pdf=False, openai=False, charts=False),
+        name="warm-up", daemon=True,
+    ).start()
+
+
+@st.cache_resource(show_spinner=False)
+def _start_metrics_server(port: int):
+    # /metrics (Prometheus text) and /metrics.json on a side port, once per server process
+    telemetry.serve_metrics(port)
 
 # Page settings
 st.set_page_config(
@@ -24,6 +48,9 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+if os.getenv("METRICS_PORT"):
+    _start_metrics_server(int(os.getenv("METRICS_PORT")))
+
 st.markdown("""
 <style>
     html, body, [class*="css"]  {
@@ -75,18 +102,65 @@ resume_file = st.file_uploader("Upload your resume (PDF)", type=["pdf"])
 mode = st.radio("Choose Analysis Mode", ["AI Resume Feedback Only", "With Job Description"], horizontal=True)
 
 jd_text = ""
+fuzzy_match = False
 if mode == "With Job Description":
     st.markdown("<h3 class='section-header'>💼 Paste Job Description</h3>", unsafe_allow_html=True)
     jd_text = st.text_area("Paste JD here", height=180)
+    fuzzy_match = st.checkbox("Fuzzy keyword matching (aliases, word forms, near spellings)")
 
 analyze_btn = st.button("🔍 Analyze Resume")
 
+SUGGESTION_BOX = '<div style="background-color: #1e2630; padding: 1rem; border-left: 4px solid #4c7bf3; border-radius: 8px;">{text}</div>'
+
 if analyze_btn and resume_file:
-    with st.spinner("Analyzing resume..."):
-        resume_text = extract_resume_text(resume_file)
+    # TRACE_DIR dumps a per-request span trace; PROFILE_DIR profiles the whole analysis
+    with st.spinner("Analyzing resume..."), telemetry.trace_request(), telemetry.profile_request():
+        try:
+            with telemetry.span("extract_resume_text"):
+                resume_text = cached_resume_text(resume_file)
+        except PDFExtractionError as e:
+            st.error(f"Could not read this PDF ({e.kind}): {e.message}")
+            st.stop()
+        with_jd = mode == "With Job Description" and jd_text.strip()
+
+        # Local scoring is fast; start the LLM request as soon as its inputs exist
+        # so it runs while the ATS check and charts are rendered
+        if with_jd:
+            # Only paragraphs edited since the last run are cleaned and re-extracted
+            if "matcher" not in st.session_state:
+                st.session_state.matcher = IncrementalMatcher()
+            matcher = st.session_state.matcher
+            # Spans clean_job_description, extract_keywords and compute_match_score
+            match_score, missing_keywords, category_breakdown = matcher.analyze(resume_text, jd_text)
+            job_description = matcher.job_description
+            if fuzzy_match:
+                with telemetry.span("compute_semantic_match_score"):
+                    match_score, missing_keywords, category_breakdown = compute_semantic_match_score(
+                        matcher.resume_keywords, matcher.jd_keywords
+                    )
+            with telemetry.span("compute_skill_match"):
+                # Taxonomy skills give a cleaner breakdown and gap list; keep the keyword view
+                # when the JD mentions no known skills
+                _, missing_skills, skill_breakdown = compute_skill_match(resume_text, jd_text)
+            if skill_breakdown:
+                category_breakdown, missing_display = skill_breakdown, missing_skills
+            else:
+                missing_display = missing_keywords
+
+            # Same keyword sets as last time: the suggestions would be the same, skip the LLM
+            suggestion_signature = matcher.signature(fuzzy_match)
+            if suggestion_signature == st.session_state.get("suggestion_signature") and "suggestions" in st.session_state:
+                suggestion_stream = iter([st.session_state.suggestions])
+            else:
+                suggestion_stream = prefetch_stream(
+                    stream_gpt_suggestions(resume_text, job_description, missing_keywords)
+                )
+        else:
+            suggestion_stream = prefetch_stream(stream_gpt_suggestions(resume_text, None, []))
 
         # ATS check
-        ats_score, ats_warnings = run_ats_checks(resume_text)
+        with telemetry.span("run_ats_checks"):
+            ats_score, ats_warnings = run_ats_checks(resume_text)
         st.markdown("<h3 class='section-header'>📄 ATS Compatibility Check</h3>", unsafe_allow_html=True)
         st.markdown(f"**ATS Score:** {ats_score}/100")
         if ats_warnings:
@@ -94,43 +168,55 @@ if analyze_btn and resume_file:
         else:
             st.success("Your resume passed common ATS checks.")
 
-        if mode == "With Job Description" and jd_text.strip():
-            job_description = clean_job_description(jd_text)
-            resume_keywords = extract_keywords(resume_text)
-            jd_keywords = extract_keywords(job_description)
-            match_score, missing_keywords, category_breakdown = compute_match_score(resume_keywords, jd_keywords)
-
+        if with_jd:
             st.markdown('<h3 class="section-header">📈 Match Score</h3>', unsafe_allow_html=True)
-            display_score(match_score, category_breakdown)
+            with telemetry.span("display_score"):
+                display_score(match_score, category_breakdown)
 
             st.markdown('<h3 class="section-header">🔑 Missing Keywords</h3>', unsafe_allow_html=True)
-            display_missing_keywords(missing_keywords)
+            display_missing_keywords(missing_display)
 
             st.markdown('<h3 class="section-header">💡 GPT Suggestions</h3>', unsafe_allow_html=True)
-            suggestions = get_gpt_suggestions(resume_text, job_description, missing_keywords)
+            with telemetry.span("gpt_suggestions"):
+                suggestions = display_streamed_text(suggestion_stream, SUGGESTION_BOX)
             st.session_state.suggestions = suggestions  # Store for chat context
-            st.markdown(f'<div style="background-color: #1e2630; padding: 1rem; border-left: 4px solid #4c7bf3; border-radius: 8px;">{suggestions}</div>', unsafe_allow_html=True)
+            if not suggestions.startswith("❌"):
+                st.session_state.suggestion_signature = suggestion_signature
 
         else:
             # No JD – general critique
             st.markdown('<h3 class="section-header">💡 AI Resume Review</h3>', unsafe_allow_html=True)
-            suggestions = get_gpt_suggestions(resume_text, None, [])
+            with telemetry.span("gpt_suggestions"):
+                suggestions = display_streamed_text(suggestion_stream, SUGGESTION_BOX)
             st.session_state.suggestions = suggestions
-            st.markdown(f'<div style="background-color: #1e2630; padding: 1rem; border-left: 4px solid #4c7bf3; border-radius: 8px;">{suggestions}</div>', unsafe_allow_html=True)
+            st.session_state.pop("suggestion_signature", None)
 
             st.markdown('<h3 class="section-header">🗨️ Chat with AI</h3>', unsafe_allow_html=True)
-            if "chat_history" not in st.session_state:
-                st.session_state.chat_history = [
-                    {"role": "system", "content": "You are an assistant helping users improve their resumes. Answer clearly and constructively."},
-                    {"role": "assistant", "content": suggestions}
-                ]
+            # Resume facts and the review are pinned compactly; old turns roll into a summary
+            # so each follow-up stays within CHAT_TOKEN_BUDGET
+            if "chat" not in st.session_state:
+                st.session_state.chat = ChatContext(CHAT_SYSTEM_PROMPT, pinned=resume_facts(resume_text, suggestions))
 
             user_q = st.text_input("Ask follow-up questions about your resume:", key="chat_input")
             if user_q:
-                st.session_state.chat_history.append({"role": "user", "content": user_q})
-                response = get_chat_response(st.session_state.chat_history)
-                st.session_state.chat_history.append({"role": "assistant", "content": response})
-                st.markdown(f"**AI:** {response}")
+                chat = st.session_state.chat
+                chat.add("user", user_q)
+                with telemetry.span("chat_response"):
+                    response = display_streamed_text(stream_chat_response(chat.messages()), "**AI:** {text}")
+                chat.add("assistant", response)
+
+    cache_stats = get_cache().stats()
+    st.sidebar.caption(f"Cache hits: {cache_stats['hits']} · misses: {cache_stats['misses']}")
+    for call_site, llm_stats in get_llm_cache().stats().items():
+        st.sidebar.caption(f"LLM cache ({call_site}): {llm_stats['hit_rate']:.0%} hit rate")
+    compression = get_compression_stats()
+    if compression["tokens_saved"]:
+        st.sidebar.caption(f"Prompt tokens saved: {compression['tokens_saved']}")
+    for call_site, latency in get_latency_stats().items():
+        if latency["last_ttft_s"] is not None:
+            st.sidebar.caption(
+                f"{call_site}: first token {latency['last_ttft_s']:.2f}s · total {latency['last_total_s']:.2f}s"
+            )
 
 elif analyze_btn:
     st.error("Please upload your resume to continue.")
@@ -141,3 +227,6 @@ st.markdown("""
     Made with ❤️ using Streamlit | Resume Match Pro © 2025
 </div>
 """, unsafe_allow_html=True)
+
+if os.getenv("WARM_UP_MODELS", "1") == "1":
+    _warm_up_once()
@@ -0,0 +1,222 @@
+"""
+Per-stage and end-to-end benchmark for the analysis pipeline.
+
+    python benchmarks/bench_pipeline.py --resumes 200 --jds 10 --output bench.json
+    python benchmarks/bench_pipeline.py --resumes 200 --jds 10 --compare bench.json --threshold 0.15
+
+Each stage is timed on its own over a synthetic corpus (see corpus.py):
+extract_resume_text, run_ats_checks, clean_job_description, extract_keywords
+and compute_match_score, plus the whole pipeline per resume with the LLM
+served by the local stub (stub_openai.py). The report has throughput,
+p50/p95/p99 latency and memory per stage: rss_delta_mb (resident memory
+after minus before, Linux only) and peak_rss_growth_mb (how far the stage
+raised the process-wide peak; 0 if an earlier stage already peaked
+higher). The overall peak is reported once. --output writes it as JSON;
+--compare checks a run against such a file and exits non-zero when a stage's
+p95 grows, or its throughput drops, by more than --threshold.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import generate_corpus  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+
+STAGES = [
+    "extract_resume_text",
+    "run_ats_checks",
+    "clean_job_description",
+    "extract_keywords",
+    "compute_match_score",
+    "end_to_end",
+]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    # ru_maxrss is a process-lifetime peak; current RSS needs /proc
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def time_stage(fn: Callable, inputs: Iterable) -> Tuple[Dict[str, float], list]:
+    latencies = []
+    outputs = []
+    rss_before, peak_before = current_rss_mb(), peak_rss_mb()
+    start = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        outputs.append(fn(item))
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    rss_after = current_rss_mb()
+
+    latencies.sort()
+    stats = {
+        "count": len(latencies),
+        "total_s": round(elapsed, 6),
+        "throughput_per_s": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+        "rss_delta_mb": round(rss_after - rss_before, 2) if rss_before is not None else None,
+        "peak_rss_growth_mb": round(peak_rss_mb() - peak_before, 2),
+    }
+    return stats, outputs
+
+
+def run_benchmark(resume_paths: List[str], jd_paths: List[str], stages: List[str]) -> Dict[str, dict]:
+    from utils.ats_checker import run_ats_checks
+    from utils.gpt_feedback import get_gpt_suggestions
+    from utils.jd_parser import clean_job_description
+    from utils.keyword_extractor import extract_keywords
+    from utils.match_scorer import compute_match_score
+    from utils.resume_parser import extract_resume_text
+
+    results = {}
+    raw_jds = []
+    for path in jd_paths:
+        with open(path, encoding="utf-8") as f:
+            raw_jds.append(f.read())
+
+    # Later stages consume earlier outputs, so inputs are always produced even if a stage isn't reported
+    stats, resume_texts = time_stage(extract_resume_text, resume_paths)
+    if "extract_resume_text" in stages:
+        results["extract_resume_text"] = stats
+
+    if "run_ats_checks" in stages:
+        results["run_ats_checks"], _ = time_stage(run_ats_checks, resume_texts)
+
+    stats, clean_jds = time_stage(clean_job_description, raw_jds)
+    if "clean_job_description" in stages:
+        results["clean_job_description"] = stats
+
+    needs_keywords = {"extract_keywords", "compute_match_score"} & set(stages)
+    if needs_keywords:
+        stats, keywords = time_stage(lambda text: extract_keywords(text, use_gpt=False), resume_texts + clean_jds)
+        if "extract_keywords" in stages:
+            results["extract_keywords"] = stats
+        resume_keywords, jd_keywords = keywords[:len(resume_texts)], keywords[len(resume_texts):]
+
+        if "compute_match_score" in stages:
+            pairs = [(r, j) for r in resume_keywords for j in jd_keywords]
+            results["compute_match_score"], _ = time_stage(lambda pair: compute_match_score(*pair), pairs)
+
+    if "end_to_end" in stages:
+        jd_raw = raw_jds[0] if raw_jds else ""
+
+        def pipeline(path):
+            resume_text = extract_resume_text(path)
+            run_ats_checks(resume_text)
+            jd_text = clean_job_description(jd_raw)
+            _, missing, _ = compute_match_score(
+                extract_keywords(resume_text, use_gpt=False), extract_keywords(jd_text, use_gpt=False)
+            )
+            return get_gpt_suggestions(resume_text, jd_text, missing, use_cache=False)
+
+        results["end_to_end"], _ = time_stage(pipeline, resume_paths)
+
+    return results
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """
+    Returns a description of every stage that regressed beyond the threshold.
+    """
+    regressions = []
+    for stage, stats in current.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        if base["p95_ms"] and stats["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{stage}: p95 {base['p95_ms']}ms -> {stats['p95_ms']}ms")
+        if base["throughput_per_s"] and stats["throughput_per_s"] < base["throughput_per_s"] * (1 - threshold):
+            regressions.append(
+                f"{stage}: throughput {base['throughput_per_s']}/s -> {stats['throughput_per_s']}/s"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline.")
+    parser.add_argument("--corpus", help="Existing corpus dir with resumes/ and jds/ (default: generate one)")
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Stub LLM response delay in seconds")
+    parser.add_argument("--output", help="Write the report (usable as a baseline) to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    server, _, base_url = start_stub_server(latency=args.llm_latency)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            if args.corpus:
+                resume_dir, jd_dir = os.path.join(args.corpus, "resumes"), os.path.join(args.corpus, "jds")
+                resume_paths = sorted(
+                    os.path.join(resume_dir, n) for n in os.listdir(resume_dir) if n.endswith(".pdf")
+                )
+                jd_paths = sorted(os.path.join(jd_dir, n) for n in os.listdir(jd_dir) if n.endswith(".txt"))
+            else:
+                resume_paths, jd_paths = generate_corpus(tmp, args.resumes, args.jds, args.pages, seed=args.seed)
+
+            stages = run_benchmark(resume_paths, jd_paths, args.stages)
+    finally:
+        server.shutdown()
+    report = {
+        "corpus": {"resumes": len(resume_paths), "jds": len(jd_paths), "pages": args.pages, "seed": args.seed},
+        "python": platform.python_version(),
+        "peak_rss_mb": round(peak_rss_mb(), 2),
+        "stages": stages,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(stages, baseline.get("stages", {}), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Synthetic resume/JD corpus generator for the benchmarks.
+
+    python benchmarks/corpus.py --out /tmp/corpus --resumes 200 --jds 20 --pages 2
+
+Resumes are written as real PDFs (via PyMuPDF) with the usual sections and
+bullet points; JDs are plain text. Skills are drawn from the bundled
+taxonomy so keyword extraction and matching have realistic overlap.
+"""
+import argparse
+import json
+import os
+import random
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FILLER = (
+    "designed built shipped maintained improved led owned delivered scaled migrated automated reduced "
+    "increased optimized launched reviewed mentored partnered analyzed integrated deployed monitored "
+    "service platform pipeline feature customers latency reliability throughput revenue cost users "
+    "dashboard workflow release system component process quality coverage incident roadmap"
+).split()
+
+SECTIONS = ["Experience", "Projects", "Education", "Skills"]
+
+
+def _skills() -> List[str]:
+    with open(os.path.join(ROOT, "data", "skills_taxonomy.json"), encoding="utf-8") as f:
+        return [s["name"] for s in json.load(f)["skills"]]
+
+
+def _sentence(rng: random.Random, skills: List[str], words: int) -> str:
+    parts = [rng.choice(FILLER) for _ in range(words)]
+    for _ in range(max(1, words // 6)):
+        parts.insert(rng.randrange(len(parts) + 1), rng.choice(skills))
+    return " ".join(parts).capitalize() + "."
+
+
+def make_resume_text(rng: random.Random, skills: List[str], pages: int) -> List[str]:
+    """
+    Returns the text of each page of one synthetic resume.
+    """
+    page_texts = []
+    for page in range(pages):
+        lines = []
+        if page == 0:
+            lines += [f"Candidate {rng.randrange(10 ** 6)}", "Email: candidate@example.com | Phone: (555) 010-0000", ""]
+        for section in SECTIONS:
+            lines.append(section)
+            for _ in range(rng.randint(3, 6)):
+                lines.append("• " + _sentence(rng, skills, rng.randint(8, 16)))
+            lines.append("")
+        page_texts.append("\n".join(lines))
+    return page_texts
+
+
+def make_jd_text(rng: random.Random, skills: List[str], requirements: int) -> str:
+    lines = ["We are hiring a software engineer to join our team.", "", "Responsibilities:"]
+    lines += ["- " + _sentence(rng, skills, rng.randint(6, 12)) for _ in range(requirements // 2)]
+    lines += ["", "Requirements:"]
+    lines += ["- " + _sentence(rng, skills, rng.randint(6, 12)) for _ in range(requirements)]
+    return "\n".join(lines)
+
+
+def write_pdf(path: str, page_texts: List[str]) -> None:
+    import fitz
+
+    # insert_textbox's base-14 fonts have no "•" mapping and extract it as
+    # "?"; an embedded Font keeps the bullets the ATS checks count
+    font = fitz.Font("helv")
+    doc = fitz.open()
+    for text in page_texts:
+        page = doc.new_page()
+        writer = fitz.TextWriter(page.rect)
+        writer.fill_textbox(fitz.Rect(50, 50, 560, 800), text, font=font, fontsize=9)
+        writer.write_text(page)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def generate_corpus(out_dir: str, resumes: int, jds: int, pages: int = 1, requirements: int = 10,
+                    seed: int = 0) -> Tuple[List[str], List[str]]:
+    """
+    Writes resumes/*.pdf and jds/*.txt under out_dir and returns both path lists.
+    """
+    rng = random.Random(seed)
+    skills = _skills()
+    resume_dir = os.path.join(out_dir, "resumes")
+    jd_dir = os.path.join(out_dir, "jds")
+    os.makedirs(resume_dir, exist_ok=True)
+    os.makedirs(jd_dir, exist_ok=True)
+
+    resume_paths = []
+    for i in range(resumes):
+        path = os.path.join(resume_dir, f"resume_{i:06d}.pdf")
+        write_pdf(path, make_resume_text(rng, skills, pages))
+        resume_paths.append(path)
+
+    jd_paths = []
+    for i in range(jds):
+        path = os.path.join(jd_dir, f"jd_{i:05d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_jd_text(rng, skills, requirements))
+        jd_paths.append(path)
+
+    return resume_paths, jd_paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume/JD corpus.")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--jds", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=1, help="Pages per resume")
+    parser.add_argument("--requirements", type=int, default=10, help="Requirement lines per JD")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    resume_paths, jd_paths = generate_corpus(
+        args.out, args.resumes, args.jds, args.pages, args.requirements, args.seed
+    )
+    print(f"Wrote {len(resume_paths)} resumes and {len(jd_paths)} JDs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
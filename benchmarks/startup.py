@@ -0,0 +1,84 @@
+"""
+Measures cold-start cost: how long importing the app's utils takes, and how
+long the first analysis request takes afterwards.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+`--eager` calls utils.warm_up() right after import. That loads spaCy, openai
+and fitz up front but is still the current code: the old startup also
+imported langchain, so eager timings understate it. To measure the old
+startup itself, point `--root` at a checkout of the commit before lazy
+loading:
+
+    python benchmarks/startup.py --runs 5
+    python benchmarks/startup.py --runs 5 --eager
+    git worktree add /tmp/eager-baseline <commit>
+    python benchmarks/startup.py --runs 5 --root /tmp/eager-baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import utils
+from utils.resume_parser import extract_resume_text
+from utils.jd_parser import clean_job_description
+from utils.keyword_extractor import extract_keywords
+from utils.match_scorer import compute_match_score
+from utils.ats_checker import run_ats_checks
+from utils.gpt_feedback import get_gpt_suggestions, get_chat_response
+if {eager!r}:
+    utils.warm_up(charts=False)
+t1 = time.perf_counter()
+with open({pdf!r}, "rb") as f:
+    resume_text = extract_resume_text(f)
+with open({jd!r}, encoding="utf-8") as f:
+    jd_text = clean_job_description(f.read())
+run_ats_checks(resume_text)
+compute_match_score(extract_keywords(resume_text, use_gpt=False), extract_keywords(jd_text, use_gpt=False))
+t2 = time.perf_counter()
+print(json.dumps({{"import_s": t1 - t0, "first_request_s": t2 - t1, "total_s": t2 - t0}}))
+"""
+
+
+def run_once(eager: bool, root: str = ROOT) -> dict:
+    code = _PROBE.format(
+        root=root,
+        eager=eager,
+        pdf=os.path.join(ROOT, "data", "sample_resume.pdf"),
+        jd=os.path.join(ROOT, "data", "sample_jd.txt"),
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import and first-request latency.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--eager", action="store_true", help="Call utils.warm_up() right after import")
+    parser.add_argument("--root", default=ROOT, help="Checkout whose utils to measure (default: this one)")
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
+    if args.eager and root != ROOT:
+        parser.error("--eager only applies to this checkout")
+
+    samples = [run_once(args.eager, root) for _ in range(args.runs)]
+    summary = {
+        "mode": "eager" if args.eager else "lazy" if root == ROOT else "other checkout",
+        "root": root,
+        "runs": args.runs,
+    }
+    for field in ("import_s", "first_request_s", "total_s"):
+        summary[field] = round(statistics.median(s[field] for s in samples), 4)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
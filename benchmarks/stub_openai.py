@@ -0,0 +1,146 @@
+"""
+Local stand-in for the OpenAI chat-completions API, for exercising the LLM
+code paths without network access or API cost.
+
+    python benchmarks/stub_openai.py --port 8765 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub streamlit run app.py
+
+It can also be started in-process with start_stub_server().
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = "1. Quantify your impact.\n2. Add a skills section.\n3. Tailor the summary to the role."
+
+
+class StubState:
+    def __init__(self, reply: str = DEFAULT_REPLY, latency: float = 0.0, token_latency: float = 0.0,
+                 fail_first: int = 0):
+        self.reply = reply
+        self.latency = latency
+        self.token_latency = token_latency
+        self.fail_first = fail_first
+        self.requests = []
+        self.lock = threading.Lock()
+
+
+def _make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            with state.lock:
+                state.requests.append(request)
+                should_fail = state.fail_first > 0
+                if should_fail:
+                    state.fail_first -= 1
+
+            if should_fail:
+                self._send_json(500, {"error": {"message": "stub failure", "type": "server_error"}})
+                return
+
+            time.sleep(state.latency)
+            reply = state.reply(request) if callable(state.reply) else state.reply
+            if request.get("stream"):
+                self._stream(request, reply)
+                return
+
+            prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in request.get("messages", []))
+            completion_tokens = len(reply.split())
+            self._send_json(200, {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+
+        def _stream(self, request: dict, reply: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for i, word in enumerate(reply.split(" ")):
+                delta = word if i == 0 else " " + word
+                self._send_event({
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}],
+                })
+                time.sleep(state.token_latency)
+            self._send_event({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            })
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def _send_event(self, payload: dict) -> None:
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+    return Handler
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, **state_kwargs):
+    """
+    Starts the stub on a daemon thread. Returns (server, state, base_url);
+    call server.shutdown() when done.
+    """
+    state = StubState(**state_kwargs)
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}/v1"
+    return server, state, base_url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake chat-completions API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before replying")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds between streamed tokens")
+    parser.add_argument("--fail-first", type=int, default=0, help="Answer the first N requests with HTTP 500")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(
+        StubState(latency=args.latency, token_latency=args.token_latency, fail_first=args.fail_first)
+    ))
+    print(f"Stub chat-completions API on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
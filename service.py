@@ -0,0 +1,336 @@
+"""
+Headless JSON API over the analysis pipeline, as a plain ASGI app.
+
+    uvicorn service:app --host 0.0.0.0 --port 8000 --workers 2
+
+Endpoints:
+    GET  /health
+    GET  /metrics, /metrics.json
+    POST /analyze  {"resume_text" | "resume_pdf_base64", "jd_text"?, "suggestions"?: true}
+    POST /batch    {"resumes": [{"id"?, "resume_text" | "resume_pdf_base64"}], "jd_text"?, "suggestions"?: false}
+
+PDF extraction, ATS checks, keyword extraction and scoring run in a process
+pool whose workers load spaCy once at start, so the event loop only parses
+requests and awaits the pool and the LLM. Bodies over SERVICE_MAX_BODY_BYTES
+get 413; once SERVICE_MAX_INFLIGHT documents are being processed, new
+requests get 503 with Retry-After instead of queueing without bound.
+"""
+import asyncio
+import base64
+import binascii
+import json
+import multiprocessing
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from utils import telemetry
+
+SERVICE_MAX_BODY_BYTES = int(os.getenv("SERVICE_MAX_BODY_BYTES", str(10 * 1024 * 1024)))
+SERVICE_MAX_BATCH = int(os.getenv("SERVICE_MAX_BATCH", "100"))
+SERVICE_MAX_INFLIGHT = int(os.getenv("SERVICE_MAX_INFLIGHT", "64"))
+SERVICE_CPU_WORKERS = int(os.getenv("SERVICE_CPU_WORKERS", str(os.cpu_count() or 1)))
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[List[tuple]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or []
+
+
+# Pool side: runs in worker processes
+
+def _init_worker() -> None:
+    from utils import warm_up
+    warm_up(spacy_model=True, pdf=True, openai=False, charts=False)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _prepare_jd(jd_text: str) -> dict:
+    from utils.jd_parser import clean_job_description
+    from utils.keyword_extractor import extract_keywords
+
+    job_description = clean_job_description(jd_text)
+    return {"raw": jd_text, "text": job_description, "keywords": extract_keywords(job_description, use_gpt=False)}
+
+
+def _analyze(resume: dict, jd: Optional[dict]) -> dict:
+    from utils.ats_checker import run_ats_checks
+    from utils.keyword_extractor import extract_keywords
+    from utils.match_scorer import compute_match_score, compute_skill_match
+    from utils.resume_parser import extract_document
+
+    result = {"id": resume.get("id"), "pages": None, "truncated": False}
+    if resume.get("pdf") is not None:
+        extracted = extract_document(resume["pdf"])
+        if extracted["error"]:
+            result["error"] = extracted["error"]
+            return result
+        resume_text = extracted["text"]
+        result["pages"], result["truncated"] = extracted["pages"], extracted["truncated"]
+    else:
+        resume_text = resume["text"]
+
+    ats_score, ats_warnings = run_ats_checks(resume_text)
+    result["ats"] = {"score": ats_score, "warnings": ats_warnings}
+    result["match"] = None
+    if jd is not None:
+        resume_keywords = extract_keywords(resume_text, use_gpt=False)
+        match_score, missing_keywords, category_breakdown = compute_match_score(resume_keywords, jd["keywords"])
+        skill_score, missing_skills, skill_breakdown = compute_skill_match(resume_text, jd["raw"])
+        result["match"] = {
+            "score": match_score,
+            "missing_keywords": sorted(missing_keywords),
+            "category_breakdown": category_breakdown,
+            "skill_score": skill_score,
+            "missing_skills": missing_skills,
+            "skill_breakdown": skill_breakdown,
+        }
+        result["_missing_keywords"] = missing_keywords
+    result["_resume_text"] = resume_text
+    return result
+
+
+# Event-loop side
+
+class ScoringService:
+    def __init__(self, cpu_workers: int = SERVICE_CPU_WORKERS, max_inflight: int = SERVICE_MAX_INFLIGHT):
+        self.cpu_workers = cpu_workers
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+    async def start(self) -> None:
+        # spawn, not fork: the server process already runs threads and an event loop
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.cpu_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        # Start every worker now so the spaCy load isn't paid by the first requests
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ping) for _ in range(self.cpu_workers)))
+
+    async def stop(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def _acquire(self, documents: int) -> None:
+        if self.inflight + documents > self.max_inflight:
+            telemetry.increment("service_rejected_total")
+            raise HTTPError(503, "Server is busy, retry shortly", [(b"retry-after", b"1")])
+        self.inflight += documents
+
+    def _release(self, documents: int) -> None:
+        self.inflight -= documents
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+    async def _finish(self, result: dict, jd: Optional[dict], suggestions: bool) -> dict:
+        resume_text = result.pop("_resume_text", None)
+        missing_keywords = result.pop("_missing_keywords", [])
+        if suggestions and resume_text is not None:
+            from utils.gpt_feedback import get_gpt_suggestions_async
+
+            result["suggestions"] = await get_gpt_suggestions_async(
+                resume_text, jd["text"] if jd else None, missing_keywords
+            )
+        return result
+
+    async def analyze(self, payload: dict) -> dict:
+        resume = _parse_resume(payload)
+        jd_text = _optional_str(payload, "jd_text")
+        suggestions = _optional_bool(payload, "suggestions", True)
+
+        self._acquire(1)
+        try:
+            with telemetry.span("service.analyze"):
+                jd = await self._run(_prepare_jd, jd_text) if jd_text else None
+                result = await self._run(_analyze, resume, jd)
+                if "error" in result:
+                    raise HTTPError(422, result["error"]["message"])
+                return await self._finish(result, jd, suggestions)
+        finally:
+            self._release(1)
+
+    async def batch(self, payload: dict) -> dict:
+        items = payload.get("resumes")
+        if not isinstance(items, list) or not items:
+            raise HTTPError(400, "'resumes' must be a non-empty list")
+        # A batch over the in-flight budget could never be admitted, so 413 rather than 503
+        max_batch = min(SERVICE_MAX_BATCH, self.max_inflight)
+        if len(items) > max_batch:
+            raise HTTPError(413, f"At most {max_batch} resumes per batch")
+        resumes = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                raise HTTPError(400, f"resumes[{index}] must be an object")
+            resume = _parse_resume(item)
+            resume["id"] = item.get("id", index)
+            resumes.append(resume)
+        jd_text = _optional_str(payload, "jd_text")
+        suggestions = _optional_bool(payload, "suggestions", False)
+
+        self._acquire(len(resumes))
+        try:
+            with telemetry.span("service.batch"):
+                jd = await self._run(_prepare_jd, jd_text) if jd_text else None
+
+                async def one(resume):
+                    result = await self._run(_analyze, resume, jd)
+                    if "error" in result:
+                        return result
+                    return await self._finish(result, jd, suggestions)
+
+                results = await asyncio.gather(*(one(r) for r in resumes))
+            return {"results": results}
+        finally:
+            self._release(len(resumes))
+
+
+def _optional_str(payload: dict, field: str) -> Optional[str]:
+    value = payload.get(field)
+    if value is not None and not isinstance(value, str):
+        raise HTTPError(400, f"'{field}' must be a string")
+    return value if value and value.strip() else None
+
+
+def _optional_bool(payload: dict, field: str, default: bool) -> bool:
+    value = payload.get(field, default)
+    if not isinstance(value, bool):
+        raise HTTPError(400, f"'{field}' must be a boolean")
+    return value
+
+
+def _parse_resume(payload: dict) -> dict:
+    text, pdf = payload.get("resume_text"), payload.get("resume_pdf_base64")
+    if (text is None) == (pdf is None):
+        raise HTTPError(400, "Provide exactly one of 'resume_text' or 'resume_pdf_base64'")
+    if text is not None:
+        if not isinstance(text, str):
+            raise HTTPError(400, "'resume_text' must be a string")
+        return {"text": text, "pdf": None}
+    try:
+        return {"text": None, "pdf": base64.b64decode(pdf, validate=True)}
+    except (TypeError, ValueError, binascii.Error):
+        raise HTTPError(400, "'resume_pdf_base64' is not valid base64")
+
+
+async def _read_body(receive, headers: dict) -> bytes:
+    length = headers.get(b"content-length")
+    if length is not None and length.isdigit() and int(length) > SERVICE_MAX_BODY_BYTES:
+        raise HTTPError(413, f"Request body exceeds {SERVICE_MAX_BODY_BYTES} bytes")
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "Client disconnected")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > SERVICE_MAX_BODY_BYTES:
+            raise HTTPError(413, f"Request body exceeds {SERVICE_MAX_BODY_BYTES} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send(send, status: int, body: bytes, content_type: bytes = b"application/json",
+                headers: Optional[List[tuple]] = None) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())] + (headers or []),
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def create_app(service: Optional[ScoringService] = None):
+    service = service or ScoringService()
+    routes = {
+        ("POST", "/analyze"): service.analyze,
+        ("POST", "/batch"): service.batch,
+    }
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await service.start()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await service.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            await lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        method, path = scope["method"], scope["path"]
+        status = 200
+        started = False
+        raw_send = send
+
+        async def send(message):
+            # Tracks whether a response began, so a late failure doesn't start a second one
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await raw_send(message)
+
+        try:
+            if method == "GET" and path == "/health":
+                await _send(send, 200, _json({"status": "ok", "inflight": service.inflight}))
+            elif method == "GET" and path == "/metrics":
+                await _send(send, 200, telemetry.render_prometheus().encode("utf-8"), b"text/plain; version=0.0.4")
+            elif method == "GET" and path == "/metrics.json":
+                await _send(send, 200, _json(telemetry.metrics_json()))
+            elif (method, path) in routes:
+                body = await _read_body(receive, dict(scope["headers"]))
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    raise HTTPError(400, "Body must be JSON")
+                if not isinstance(payload, dict):
+                    raise HTTPError(400, "Body must be a JSON object")
+                await _send(send, 200, _json(await routes[(method, path)](payload)))
+            elif any(route_path == path for _, route_path in routes):
+                raise HTTPError(405, "Method not allowed")
+            else:
+                raise HTTPError(404, "Not found")
+        except HTTPError as e:
+            status = e.status
+            await _send(send, e.status, _json({"error": e.message}), headers=e.headers)
+        except Exception:
+            # A bug or a crashed pool worker: log it and still answer in JSON
+            status = 500
+            print(f"Unhandled error in {method} {path}:", file=sys.stderr)
+            traceback.print_exc()
+            if not started:
+                await _send(send, 500, _json({"error": "Internal server error"}))
+        finally:
+            telemetry.increment("service_requests_total", status=str(status))
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from utils.ats_checker import AnyKeywordRule, ATSRuleEngine, run_ats_checks, run_ats_checks_batch
+
+
+def baseline_ats_checks(resume_text: str) -> tuple:
+    # The checker as it was before the rule engine, kept as the reference
+    warnings = []
+    score = 100
+    if len(resume_text) < 500:
+        warnings.append("Resume content is too short; consider adding more detail.")
+        score -= 20
+    if not any(keyword in resume_text.lower() for keyword in ["experience", "projects", "education"]):
+        warnings.append("Key sections like 'Experience', 'Projects', or 'Education' are missing.")
+        score -= 15
+    if not any(k in resume_text.lower() for k in ["contact", "email", "phone"]):
+        warnings.append("Missing contact information (email or phone).")
+        score -= 10
+    if resume_text.count("•") < 5:
+        warnings.append("Consider using bullet points for readability.")
+        score -= 5
+    if len(set(resume_text.lower().split())) < len(resume_text.split()) * 0.5:
+        warnings.append("Too many repeated words. Avoid keyword stuffing.")
+        score -= 5
+    if not resume_text.lower().endswith("pdf"):
+        warnings.append("Use PDF format to avoid parsing issues with ATS.")
+    return max(score, 0), warnings
+
+
+VOCABULARY = [
+    "Experience", "EXPERIENCE", "projects", "Education", "contact", "Email:", "phone", "emailing",
+    "experienced", "python", "sql", "built", "team", "•", "• led", "-", "pdf", "PDF", "resume.pdf",
+    "contactless", "phon", "educat", "Ünïcode", "İstanbul", "\n", "\t", "data", "data", "data",
+]
+
+
+def _random_resume(rng: random.Random) -> str:
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(0, 200))]
+    text = rng.choice([" ", "\n", ""]).join(words)
+    return text + rng.choice(["", "pdf", " PDF", "\n"])
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_engine_matches_baseline(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        text = _random_resume(rng)
+        assert run_ats_checks(text) == baseline_ats_checks(text), text
+
+
+@pytest.mark.parametrize("text", ["", "pdf", "•" * 5, "x" * 500, "Experience • Contact\n" * 40 + "resume.pdf"])
+def test_edge_cases_match_baseline(text):
+    assert run_ats_checks(text) == baseline_ats_checks(text)
+
+
+def test_batch_matches_single():
+    rng = random.Random(42)
+    texts = [_random_resume(rng) for _ in range(50)]
+    results = run_ats_checks_batch(texts, timings=True)
+    for text, result in zip(texts, results):
+        assert (result.score, result.warnings) == run_ats_checks(text)
+        assert set(result.timings) >= {"_features", "length", "sections"}
+
+
+def test_overlapping_patterns_are_all_found():
+    # "contact" hides "act" and "tac" from a non-overlapping regex scan
+    engine = ATSRuleEngine([
+        AnyKeywordRule("a", "a", 1, keywords=["contact"]),
+        AnyKeywordRule("b", "b", 1, keywords=["tac"]),
+        AnyKeywordRule("c", "c", 1, keywords=["act"]),
+    ])
+    assert engine.evaluate("Contact me").failed == []
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from utils.batch_scorer import compute_match_matrix
+from utils.match_scorer import CATEGORY_KEYWORDS, compute_match_score
+
+CATEGORY_TERMS = sorted({kw for keywords in CATEGORY_KEYWORDS.values() for kw in keywords})
+OTHER_TERMS = ["lead", "mentoring", "Agile", "REST", "graphql", "terraform", "Excel", "budgeting", "research"]
+
+
+def _random_keywords(rng: random.Random, max_size: int):
+    pool = CATEGORY_TERMS + OTHER_TERMS
+    keywords = rng.sample(pool, rng.randint(0, min(max_size, len(pool))))
+    # Case variants and duplicates must collapse the same way in both scorers
+    return keywords + [kw.upper() for kw in keywords[:2]] + keywords[:1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_compute_match_score_for_every_pair(seed):
+    rng = random.Random(seed)
+    resumes = [_random_keywords(rng, 25) for _ in range(12)] + [[]]
+    jds = [_random_keywords(rng, 15) for _ in range(6)] + [[]]
+
+    result = compute_match_matrix(resumes, jds)
+
+    assert result.shape == (len(resumes), len(jds))
+    for i, resume_keywords in enumerate(resumes):
+        for j, jd_keywords in enumerate(jds):
+            score, missing, breakdown = compute_match_score(resume_keywords, jd_keywords)
+            batch_score, batch_missing, batch_breakdown = result.result(i, j)
+            assert batch_score == score
+            assert sorted(batch_missing) == sorted(missing)
+            assert batch_breakdown == breakdown
+
+
+def test_empty_inputs():
+    result = compute_match_matrix([], [["python"]])
+    assert result.shape == (0, 1)
@@ -0,0 +1,9 @@
+from corpus import generate_corpus
+from utils.resume_parser import extract_document
+
+
+def test_generated_resumes_extract_with_bullets(tmp_path):
+    resumes, jds = generate_corpus(str(tmp_path), resumes=2, jds=1, pages=2)
+    text = extract_document(resumes[0])["text"]
+    assert text.count("•") >= 5
+    assert "?" not in text
@@ -0,0 +1,116 @@
+import json
+import os
+
+import pytest
+
+from utils.bulk_ingest import _Writer, jd_column_names, run_ingest
+
+JDS = ["backend.txt", "data.txt"]
+
+
+def _rows(start, count):
+    return [
+        {"source": f"r{i}.pdf", "pages": 1, "truncated": False, "error": None, "ats_score": 80, "ats_failed": [],
+         "matches": [{"score": 50.0, "missing_keywords": []}, {"score": 25.0, "missing_keywords": ["sql"]}]}
+        for i in range(start, start + count)
+    ]
+
+
+def _write_all(output, fmt, batches):
+    writer = _Writer(output, fmt, "resumes", JDS)
+    for rows in batches:
+        writer.write(rows)
+    writer.close()
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_writer_resumes_after_the_last_flush(tmp_path, fmt):
+    expected = str(tmp_path / f"expected.{fmt}")
+    _write_all(expected, fmt, [_rows(0, 3), _rows(3, 2), _rows(5, 4)])
+
+    output = str(tmp_path / f"results.{fmt}")
+    _write_all(output, fmt, [_rows(0, 3), _rows(3, 2)])
+    with open(output, "ab") as f:
+        f.write(b'{"source": "r5.pdf", "pag')  # crashed mid-batch
+
+    writer = _Writer(output, fmt, "resumes", JDS)
+    assert writer.done == 5
+    writer.write(_rows(5, 4))
+    writer.close()
+
+    with open(output, "rb") as result, open(expected, "rb") as reference:
+        assert result.read() == reference.read()
+    with open(output + ".checkpoint", encoding="utf-8") as f:
+        assert json.load(f)["done"] == 9
+
+
+def test_checkpoint_is_rejected_when_the_output_lost_rows(tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    _write_all(output, "jsonl", [_rows(0, 3)])
+    size = os.path.getsize(output)
+    with open(output, "r+b") as f:
+        f.truncate(size // 2)
+
+    with pytest.raises(FileExistsError):
+        _Writer(output, "jsonl", "resumes", JDS)
+
+    writer = _Writer(output, "jsonl", "resumes", JDS, overwrite=True)
+    assert writer.done == 0
+    writer.close()
+    assert os.path.getsize(output) == 0
+
+
+def test_checkpoint_for_another_run_is_not_resumed(tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    _write_all(output, "jsonl", [_rows(0, 3)])
+
+    with pytest.raises(FileExistsError):
+        _Writer(output, "jsonl", "resumes", ["other.txt"])
+    with pytest.raises(FileExistsError):
+        _Writer(output, "jsonl", "other-resumes", JDS)
+
+
+def test_jd_column_names_are_unique(tmp_path):
+    assert jd_column_names(["jds/a.txt", "jds/b.txt"]) == ["a.txt", "b.txt"]
+
+    backend, data = tmp_path / "backend" / "jd.txt", tmp_path / "data" / "jd.txt"
+    assert jd_column_names([str(backend), str(data)]) == [
+        os.path.join("backend", "jd.txt"), os.path.join("data", "jd.txt")
+    ]
+    assert jd_column_names([str(data), str(data)]) == ["jd.txt", "jd.txt#2"]
+
+
+def _spacy_model_available():
+    try:
+        import spacy
+
+        spacy.load("en_core_web_sm")
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+@pytest.mark.skipif(not _spacy_model_available(), reason="needs the en_core_web_sm spaCy model")
+def test_rerun_resumes_from_the_checkpoint(tmp_path):
+    from corpus import generate_corpus
+
+    resumes, jds = generate_corpus(str(tmp_path / "corpus"), resumes=5, jds=2)
+    source = os.path.dirname(resumes[0])
+    output = str(tmp_path / "results.jsonl")
+    run = dict(extract_workers=1, batch_size=2, progress=False)
+
+    assert run_ingest(source, output, jds, **run) == 5
+    with open(output, encoding="utf-8") as f:
+        complete = f.read()
+
+    # Roll the checkpoint back to the first flushed batch, as if the run had stopped there
+    first_batch = "".join(complete.splitlines(keepends=True)[:2]).encode("utf-8")
+    with open(output + ".checkpoint", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    checkpoint.update(done=2, output_bytes=len(first_batch))
+    with open(output + ".checkpoint", "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+
+    assert run_ingest(source, output, jds, **run) == 3
+    with open(output, encoding="utf-8") as f:
+        assert f.read() == complete
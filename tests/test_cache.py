@@ -0,0 +1,38 @@
+from utils import cache as cache_module
+from utils.cache import ContentCache, content_key
+
+
+def test_memory_hits_return_copies():
+    cache = ContentCache(cache_dir=None)
+    keywords = ["python", "sql"]
+    cache.put("key", keywords)
+    keywords.append("caller edit")
+
+    first = cache.get("key")
+    first.append("another edit")
+    assert cache.get("key") == ["python", "sql"]
+    assert cache.stats()["memory_hits"] == 2
+
+
+def test_disk_hits_are_promoted_as_copies(tmp_path):
+    ContentCache(cache_dir=str(tmp_path)).put("key", ["python"])
+    cache = ContentCache(cache_dir=str(tmp_path))
+
+    cache.get("key").append("edit")
+    assert cache.get("key") == ["python"]
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_get_or_compute_result_is_not_the_cached_object():
+    cache = ContentCache(cache_dir=None)
+    value = cache.get_or_compute("key", lambda: ["python"])
+    value.clear()
+    assert cache.get_or_compute("key", lambda: ["recomputed"]) == ["python"]
+
+
+def test_keys_change_with_the_pipeline_version(monkeypatch):
+    key = content_key("keywords", "resume text")
+    assert key == content_key("keywords", "resume text".encode("utf-8"))
+    assert key != content_key("keywords+gpt", "resume text")
+    monkeypatch.setattr(cache_module, "PIPELINE_VERSION", "old")
+    assert key != content_key("keywords", "resume text")
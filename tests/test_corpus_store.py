@@ -0,0 +1,82 @@
+import os
+import random
+
+import pytest
+
+from utils.ats_checker import DEFAULT_RULES
+from utils.corpus_store import CorpusStore
+from utils.match_scorer import CATEGORY_KEYWORDS, compute_match_score
+
+TERMS = sorted({kw for keywords in CATEGORY_KEYWORDS.values() for kw in keywords}) + ["graphql", "excel", "agile"]
+RULES = [rule.name for rule in DEFAULT_RULES]
+
+
+def _random_document(rng: random.Random, index: int) -> dict:
+    keywords = rng.sample(TERMS, rng.randint(0, 12))
+    return {
+        "source": f"résumés/{index:03d}-{rng.choice(['a', 'ü', '日本'])}.pdf",
+        "text": " ".join(keywords) + rng.choice(["", " • déjà vu", "\n\n"]),
+        "ats_score": rng.randint(0, 100),
+        "ats_failed": rng.sample(RULES, rng.randint(0, len(RULES))),
+        # Case and duplicates collapse the same way compute_match_score does
+        "keywords": keywords + [kw.upper() for kw in keywords[:1]] + keywords[:1],
+    }
+
+
+def _assert_round_trip(store, documents):
+    assert len(store) == len(documents)
+    for i, doc in enumerate(documents):
+        assert store.source(i) == doc["source"]
+        assert store.text(i) == doc["text"]
+        assert sorted(store.keywords(i)) == sorted({kw.lower() for kw in doc["keywords"]})
+        score, failed = store.ats(i)
+        assert score == doc["ats_score"]
+        assert failed == [name for name in RULES if name in doc["ats_failed"]]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_append_reopen_and_score(tmp_path, seed):
+    rng = random.Random(seed)
+    documents = [_random_document(rng, i) for i in range(60)]
+    path = str(tmp_path / "store")
+
+    store = CorpusStore(path)
+    for start in range(0, 40, 13):
+        store.append(documents[start:min(start + 13, 40)])
+    # A second handle appends after the first one's commits
+    CorpusStore(path).append(documents[40:])
+
+    reopened = CorpusStore(path)
+    _assert_round_trip(reopened, documents)
+
+    for _ in range(5):
+        jd = rng.sample(TERMS, rng.randint(1, 10)) + ["not-in-vocabulary"]
+        expected = [compute_match_score(doc["keywords"], jd)[0] for doc in documents]
+        assert list(reopened.score_against(jd)) == expected
+
+        ranked = sorted(range(len(documents)), key=lambda i: (-expected[i], i))[:7]
+        assert reopened.top_k(jd, 7) == [(documents[i]["source"], expected[i]) for i in ranked]
+
+
+def test_uncommitted_append_is_rolled_back(tmp_path):
+    rng = random.Random(7)
+    documents = [_random_document(rng, i) for i in range(6)]
+    path = str(tmp_path / "store")
+    CorpusStore(path).append(documents[:3])
+
+    # Simulate a crash after the column writes but before meta.json
+    for name in ("keyword_ids.bin", "text.bin", "sources.bin", "ats_score.bin"):
+        with open(os.path.join(path, name), "ab") as f:
+            f.write(b"\x01partial")
+
+    store = CorpusStore(path)
+    _assert_round_trip(store, documents[:3])
+    store.append(documents[3:])
+    _assert_round_trip(CorpusStore(path), documents)
+
+
+def test_empty_store(tmp_path):
+    store = CorpusStore(str(tmp_path / "store"))
+    assert len(store) == 0
+    assert store.append([]) == 0
+    assert store.top_k(["python"]) == []
@@ -0,0 +1,159 @@
+import json
+import re
+import threading
+import time
+
+import openai
+import pytest
+
+from utils import gpt_keywords, llm_client
+from utils.gpt_keywords import KeywordBatcher, _extract_batch, _validate
+
+DOCUMENT = re.compile(r'<document id="\d+">\n(.*?)\n</document>', re.S)
+
+
+def _reply(items):
+    return json.dumps({"items": items})
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (_reply([{"id": 0, "keywords": ["python"]}, {"id": 1, "keywords": []}]), [["python"], []]),
+    ("not json", [None, None]),
+    ("[1, 2]", [None, None]),
+    (json.dumps({"items": {"id": 0}}), [None, None]),
+    (_reply([{"id": 1, "keywords": ["sql"]}]), [None, ["sql"]]),
+    (_reply([{"id": True, "keywords": ["sql"]}, {"id": 1.0, "keywords": ["aws"]}]), [None, None]),
+    (_reply([{"id": "0", "keywords": ["sql"]}, {"id": 2, "keywords": ["aws"]}, {"id": -1, "keywords": []}]),
+     [None, None]),
+    (_reply([{"id": 0, "keywords": "python"}, {"id": 1, "keywords": ["sql", 3]}]), [None, None]),
+    (_reply([{"id": 0, "keywords": ["sql"], "score": 1}, {"keywords": ["aws"]}]), [None, None]),
+    (_reply([{"id": 0, "keywords": ["sql"]}, {"id": 0, "keywords": ["aws"]}, {"id": 1, "keywords": ["go"]}]),
+     [None, ["go"]]),
+    (_reply([{"id": 0, "keywords": ["sql"]}, {"id": 0, "keywords": 5}]), [None, None]),
+])
+def test_validate(raw, expected):
+    assert _validate(raw, 2) == expected
+
+
+class FakeCompletions:
+    """
+    Stands in for complete_text: answers from `respond(texts)` and records
+    the documents sent in each request.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+
+    def __call__(self, messages, **kwargs):
+        texts = DOCUMENT.findall(messages[1]["content"])
+        self.requests.append(texts)
+        return self.respond(texts)
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    def install(respond):
+        fake = FakeCompletions(respond)
+        monkeypatch.setattr(llm_client, "complete_text", fake)
+        monkeypatch.setattr(gpt_keywords, "_single", lambda text, use_cache: ["single:" + text])
+        return fake
+
+    return install
+
+
+def _answer(texts, skip=()):
+    return _reply([{"id": i, "keywords": [text]} for i, text in enumerate(texts) if text not in skip])
+
+
+TEXTS = [f"doc{i}" for i in range(8)]
+
+
+def test_valid_batch_is_one_request(completions):
+    fake = completions(_answer)
+    assert _extract_batch(TEXTS, use_cache=False) == [[t] for t in TEXTS]
+    assert fake.requests == [TEXTS]
+
+
+def test_missing_entries_are_retried_together(completions):
+    fake = completions(lambda texts: _answer(texts, skip={"doc2", "doc5"} if len(texts) == 8 else ()))
+    assert _extract_batch(TEXTS, use_cache=False) == [[t] for t in TEXTS]
+    assert fake.requests == [TEXTS, ["doc2", "doc5"]]
+
+
+def test_truncated_batches_split_until_single_requests(completions):
+    def truncated(texts):
+        raise llm_client.CompletionTruncated("length")
+
+    fake = completions(truncated)
+    assert _extract_batch(TEXTS, use_cache=False) == [["single:" + t] for t in TEXTS]
+    # A halving tree over 8 texts has 7 batch requests above its single-text leaves
+    assert len(fake.requests) == 7
+    assert sorted(len(texts) for texts in fake.requests) == [2, 2, 2, 2, 4, 4, 8]
+
+
+def test_unparseable_reply_for_a_pair_terminates(completions):
+    fake = completions(lambda texts: "{" if len(texts) == 2 else _answer(texts, skip=texts[:2]))
+    assert _extract_batch(TEXTS[:3], use_cache=False) == [["single:doc0"], ["single:doc1"], ["doc2"]]
+    assert fake.requests == [TEXTS[:3], TEXTS[:2]]
+
+
+def test_api_error_fails_the_batch_without_retries(completions):
+    def failing(texts):
+        raise openai.APIConnectionError(request=None)
+
+    fake = completions(failing)
+    assert _extract_batch(TEXTS, use_cache=False) == [[] for _ in TEXTS]
+    assert len(fake.requests) == 1
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def extract(texts, use_cache):
+        with lock:
+            calls.append(list(texts))
+        if "boom" in texts:
+            raise RuntimeError("boom")
+        return [[text.upper()] for text in texts]
+
+    monkeypatch.setattr(gpt_keywords, "extract_keywords_gpt_batch", extract)
+    return calls
+
+
+def _submit_together(batcher, texts):
+    futures = [batcher.submit(text) for text in texts]
+    return [future.result(timeout=5) for future in futures]
+
+
+def test_batcher_coalesces_requests_within_the_window(batches):
+    batcher = KeywordBatcher(window=0.2, max_items=16, use_cache=False)
+    texts = [f"resume {i}" for i in range(5)]
+    assert _submit_together(batcher, texts) == [[t.upper()] for t in texts]
+    assert batches == [texts]
+
+
+def test_batcher_caps_batch_size(batches):
+    batcher = KeywordBatcher(window=0.2, max_items=2, use_cache=False)
+    texts = [f"resume {i}" for i in range(5)]
+    assert _submit_together(batcher, texts) == [[t.upper()] for t in texts]
+    assert sorted(t for batch in batches for t in batch) == texts
+    assert max(len(batch) for batch in batches) <= 2
+
+
+def test_batcher_separates_requests_outside_the_window(batches):
+    batcher = KeywordBatcher(window=0.01, use_cache=False)
+    assert batcher.extract("first") == ["FIRST"]
+    time.sleep(0.05)
+    assert batcher.extract("second") == ["SECOND"]
+    assert batches == [["first"], ["second"]]
+
+
+def test_batcher_fails_every_future_in_a_failed_batch(batches):
+    batcher = KeywordBatcher(window=0.2, use_cache=False)
+    futures = [batcher.submit(text) for text in ("ok", "boom")]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
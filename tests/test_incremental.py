@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from utils.incremental import IncrementalMatcher, split_paragraphs
+from utils.jd_parser import clean_job_description
+from utils.match_scorer import compute_match_score
+
+VOCABULARY = ["python", "sql", "docker", "aws", "excel", "communication", "leadership", "react", "kubernetes"]
+FILLER = ["built", "the", "team", "worked", "on", "and", "with", "daily", "reports"]
+
+
+def fake_keywords(text):
+    # Stand-in for spaCy extraction: deterministic and paragraph-local
+    return sorted({word for word in text.lower().split() if word in VOCABULARY})
+
+
+def fake_whole_text_keywords(text):
+    return ["gpt-" + word for word in sorted(set(text.lower().split()))[:2]]
+
+
+@pytest.fixture(autouse=True)
+def fake_extraction(monkeypatch):
+    calls = []
+
+    def extract(paragraphs):
+        calls.append(list(paragraphs))
+        return [fake_keywords(p) for p in paragraphs]
+
+    monkeypatch.setattr(IncrementalMatcher, "_extract", staticmethod(extract))
+    monkeypatch.setattr(IncrementalMatcher, "_extract_whole", staticmethod(fake_whole_text_keywords))
+    return calls
+
+
+def _random_line(rng):
+    words = rng.sample(VOCABULARY, rng.randint(0, 2)) + rng.sample(FILLER, rng.randint(1, 4))
+    rng.shuffle(words)
+    return " ".join(w.upper() if rng.random() < 0.1 else w for w in words)
+
+
+def _random_edit(rng, lines):
+    lines = list(lines)
+    action = rng.choice(["insert", "delete", "replace", "duplicate", "blank"])
+    position = rng.randint(0, len(lines))
+    if action == "insert" or not lines:
+        lines.insert(position, _random_line(rng))
+    elif action == "delete":
+        del lines[min(position, len(lines) - 1)]
+    elif action == "replace":
+        lines[min(position, len(lines) - 1)] = _random_line(rng)
+    elif action == "duplicate":
+        lines.insert(position, rng.choice(lines))
+    else:
+        lines.insert(position, "")
+    return lines
+
+
+def _full_recompute(resume_text, jd_text):
+    resume = [k for p in split_paragraphs(resume_text) for k in fake_keywords(p)]
+    jd_paragraphs = [c for c in (clean_job_description(p) for p in split_paragraphs(jd_text)) if c]
+    jd = [k for p in jd_paragraphs for k in fake_keywords(p)]
+    score, missing, breakdown = compute_match_score(resume, jd)
+    return score, sorted(missing), breakdown
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_edits_equal_full_recompute(seed):
+    rng = random.Random(seed)
+    matcher = IncrementalMatcher(use_gpt=False)
+    resume_lines = [_random_line(rng) for _ in range(30)]
+    jd_lines = [_random_line(rng) for _ in range(10)]
+
+    for _ in range(60):
+        if rng.random() < 0.7:
+            resume_lines = _random_edit(rng, resume_lines)
+        else:
+            jd_lines = _random_edit(rng, jd_lines)
+        resume_text, jd_text = "\n".join(resume_lines), "\n".join(jd_lines)
+
+        result = matcher.analyze(resume_text, jd_text)
+        fresh = IncrementalMatcher(use_gpt=False)
+        assert result == fresh.analyze(resume_text, jd_text) == _full_recompute(resume_text, jd_text)
+        assert matcher.signature() == fresh.signature()
+
+
+def test_only_changed_paragraphs_are_extracted(fake_extraction):
+    matcher = IncrementalMatcher(use_gpt=False)
+    resume = "Python and SQL\n\nDocker daily\n\nExcel reports"
+    matcher.analyze(resume, "python docker aws")
+    fake_extraction.clear()
+
+    matcher.analyze(resume.replace("Docker daily", "Kubernetes daily"), "python docker aws")
+    assert fake_extraction == [["Kubernetes daily"]]
+    assert matcher.last_stats["extracted"] == 1
+
+
+def test_whole_text_fallback_is_replaced_once_paragraphs_have_keywords():
+    matcher = IncrementalMatcher(use_gpt=True)
+    jd = "python sql aws"
+
+    score, missing, _ = matcher.analyze("built reports\n\nworked daily", jd)
+    assert score == 0.0
+    assert sorted(matcher.resume_keywords) == ["gpt-built", "gpt-daily"]
+
+    result = matcher.analyze("built reports with python\n\nworked daily", jd)
+    assert matcher.resume_keywords == ["python"]
+    assert result == _full_recompute("built reports with python\n\nworked daily", jd)
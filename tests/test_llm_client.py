@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+
+import openai
+import pytest
+
+from stub_openai import DEFAULT_REPLY, start_stub_server
+from utils import llm_client
+
+MESSAGES = [{"role": "user", "content": "Review this resume."}]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """
+    Starts a stub chat-completions server with the given StubState options
+    and points both OpenAI clients at it.
+    """
+    servers = []
+
+    def start(**state_kwargs):
+        server, state, base_url = start_stub_server(**state_kwargs)
+        servers.append(server)
+        monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        # The sync client is process-wide; async clients are per event loop
+        monkeypatch.setattr(llm_client, "_client", None)
+        monkeypatch.setattr(llm_client, "LLM_BACKOFF_BASE", 0.01)
+        return state
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_chat_completion_async(stub):
+    state = stub()
+    response = asyncio.run(llm_client.chat_completion(MESSAGES, temperature=0, max_tokens=50))
+    assert response.choices[0].message.content == DEFAULT_REPLY
+    assert state.requests[0]["messages"] == MESSAGES
+
+
+def test_chat_completion_retries_server_errors(stub):
+    state = stub(fail_first=2)
+    response = asyncio.run(llm_client.chat_completion(MESSAGES, temperature=0, max_tokens=50, max_retries=3))
+    assert response.choices[0].message.content == DEFAULT_REPLY
+    assert len(state.requests) == 3
+
+
+def test_chat_completion_gives_up_after_max_retries(stub):
+    state = stub(fail_first=10)
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(llm_client.chat_completion(MESSAGES, temperature=0, max_tokens=50, max_retries=1))
+    assert len(state.requests) == 2
+
+
+def test_chat_completion_times_out(stub):
+    stub(latency=0.5)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(llm_client.chat_completion(MESSAGES, temperature=0, max_tokens=50, timeout=0.05, max_retries=0))
+
+
+def test_async_requests_run_concurrently(stub):
+    state = stub(latency=0.3)
+
+    async def run():
+        return await asyncio.gather(*(
+            llm_client.complete_text_async(
+                [{"role": "user", "content": f"resume {i}"}], temperature=0, max_tokens=50, use_cache=False
+            )
+            for i in range(4)
+        ))
+
+    start = time.perf_counter()
+    replies = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert replies == [DEFAULT_REPLY] * 4
+    assert len(state.requests) == 4
+    assert elapsed < 4 * 0.3
+
+
+def test_complete_text(stub):
+    stub(reply="  padded reply  ")
+    assert llm_client.complete_text(MESSAGES, temperature=0, max_tokens=50, use_cache=False) == "padded reply"
+
+
+def test_complete_text_async_keeps_cache_io_off_the_loop(stub, monkeypatch, tmp_path):
+    from utils.llm_cache import LLMResponseCache
+
+    state = stub()
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"))
+    threads = []
+
+    class RecordingCache:
+        def get(self, key, call_site="default"):
+            threads.append(threading.get_ident())
+            return cache.get(key, call_site)
+
+        def put(self, key, response):
+            threads.append(threading.get_ident())
+            cache.put(key, response)
+
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: RecordingCache())
+
+    async def run():
+        loop_thread = threading.get_ident()
+        first = await llm_client.complete_text_async(MESSAGES, temperature=0, max_tokens=50, use_cache=True)
+        second = await llm_client.complete_text_async(MESSAGES, temperature=0, max_tokens=50, use_cache=True)
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(run())
+    assert first == second == DEFAULT_REPLY
+    assert len(state.requests) == 1
+    assert len(threads) == 3 and loop_thread not in threads
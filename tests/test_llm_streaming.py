@@ -0,0 +1,71 @@
+import openai
+import pytest
+
+from stub_openai import start_stub_server
+from utils import llm_client
+
+MESSAGES = [{"role": "user", "content": "Review this resume."}]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """
+    Starts a stub chat-completions server with the given StubState options
+    and points the OpenAI client at it.
+    """
+    servers = []
+
+    def start(**state_kwargs):
+        server, state, base_url = start_stub_server(**state_kwargs)
+        servers.append(server)
+        monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setattr(llm_client, "_client", None)
+        return state
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_stream_chat_completion(stub):
+    state = stub(reply="one two three four")
+    deltas = list(llm_client.stream_chat_completion(
+        MESSAGES, temperature=0, max_tokens=50, call_site="test_stream", use_cache=False
+    ))
+
+    assert len(deltas) == 4
+    assert "".join(deltas) == "one two three four"
+    assert state.requests[0]["stream"] is True
+    call_site, time_to_first_token, total = llm_client.LATENCY_LOG[-1]
+    assert call_site == "test_stream"
+    assert 0 <= time_to_first_token <= total
+
+
+def test_prefetch_stream(stub):
+    stub(reply="streamed in the background", token_latency=0.01)
+    stream = llm_client.prefetch_stream(llm_client.stream_chat_completion(
+        MESSAGES, temperature=0, max_tokens=50, call_site="test_prefetch", use_cache=False
+    ))
+    assert "".join(stream) == "streamed in the background"
+
+
+def test_prefetch_stream_reraises_errors():
+    def failing_stream():
+        yield "partial "
+        raise openai.APIConnectionError(request=None)
+
+    stream = llm_client.prefetch_stream(failing_stream())
+    assert next(stream) == "partial "
+    with pytest.raises(openai.APIConnectionError):
+        next(stream)
+
+
+def test_prefetch_stream_reports_server_errors(stub):
+    stub(fail_first=10)
+    # The sync client retries on its own, so every attempt fails
+    stream = llm_client.prefetch_stream(llm_client.stream_chat_completion(
+        MESSAGES, temperature=0, max_tokens=50, call_site="test_prefetch_error", use_cache=False
+    ))
+    with pytest.raises(openai.InternalServerError):
+        list(stream)
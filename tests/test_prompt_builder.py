@@ -0,0 +1,41 @@
+import pytest
+
+from utils.constants import DEFAULT_MODEL
+from utils.gpt_feedback import _suggestion_messages
+from utils.llm_cache import cache_key
+from utils.prompt_builder import build_suggestion_prompt
+
+RESUME = "Jane Doe\nSkills\nPython, SQL, Excel\nExperience\nBuilt reporting pipelines in Python."
+JD = "We need a data engineer with Python, Spark, Airflow, Kubernetes and AWS experience."
+MISSING = ["spark", "airflow", "kubernetes", "aws", "engineer", "data"]
+
+
+def _key(missing_keywords, jd_text=JD):
+    messages = _suggestion_messages(RESUME, jd_text, missing_keywords)
+    return cache_key(DEFAULT_MODEL, messages, 0.4, 400)
+
+
+def test_cache_key_ignores_missing_keyword_order():
+    # Missing keywords come from set differences, so their order varies between processes
+    assert _key(MISSING) == _key(list(reversed(MISSING)))
+    assert _key(MISSING) == _key(sorted(MISSING, key=lambda k: k[::-1]))
+
+
+def test_cache_key_ignores_order_when_packing():
+    long_jd = " ".join([JD] * 200)
+    assert _key(MISSING, long_jd) == _key(list(reversed(MISSING)), long_jd)
+
+
+def test_prompt_under_budget_is_unchanged():
+    prompt = build_suggestion_prompt(RESUME, JD, MISSING, budget=1500)
+    assert prompt.resume == RESUME
+    assert prompt.jd == JD
+    assert prompt.keywords == sorted(MISSING)
+    assert prompt.tokens_saved == 0
+
+
+@pytest.mark.parametrize("resume_repeats", [1, 200])
+def test_packed_prompt_fits_budget(resume_repeats):
+    prompt = build_suggestion_prompt(RESUME * resume_repeats, " ".join([JD] * 200), MISSING, budget=600)
+    assert prompt.prompt_tokens <= 600
+    assert prompt.tokens_saved > 0
@@ -0,0 +1,61 @@
+import pytest
+
+from utils.match_scorer import compute_match_score
+from utils.semantic_matcher import (
+    SEMANTIC_THRESHOLD,
+    compute_semantic_match_score,
+    lemma,
+    semantic_match_matrix,
+    similarity_matrix,
+)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("service", "services"),
+    ("engineer", "engineering"),
+    ("engineer", "engineers"),
+    ("process", "processes"),
+    ("develop", "developing"),
+    ("developed", "develops"),
+    ("manage", "managing"),
+    ("management", "managed"),
+    ("optimization", "optimize"),
+    ("running", "runs"),
+    ("applied", "applies"),
+    ("install", "installed"),
+])
+def test_inflections_share_a_stem(a, b):
+    assert lemma(a) == lemma(b)
+    assert similarity_matrix([a], [b])[0, 0] >= SEMANTIC_THRESHOLD
+
+
+@pytest.mark.parametrize("a, b", [
+    ("engineer", "engine"),
+    ("developer", "develop"),
+    ("string", "sting"),
+])
+def test_distinct_words_stay_apart(a, b):
+    assert lemma(a) != lemma(b)
+    assert similarity_matrix([a], [b])[0, 0] < SEMANTIC_THRESHOLD
+
+
+@pytest.mark.parametrize("word", ["process", "status", "analysis", "speed", "string", "class", "aws", "java"])
+def test_words_without_inflection_are_kept(word):
+    assert lemma(word) == word
+
+
+def test_identical_keywords_match_like_exact_scoring():
+    resume = ["python", "sql", "docker"]
+    jd = ["python", "docker", "terraform"]
+    score, missing, breakdown = compute_semantic_match_score(resume, jd, threshold=1.0)
+    exact_score, exact_missing, exact_breakdown = compute_match_score(resume, jd)
+    assert (score, sorted(missing), breakdown) == (exact_score, sorted(exact_missing), exact_breakdown)
+
+
+def test_matrix_equals_pairwise_scores():
+    resumes = [["postgres", "kubernetes", "developing"], ["excel"], []]
+    jds = [["postgresql", "k8s", "development"], ["excel", "communication"]]
+    matrix = semantic_match_matrix(resumes, jds)
+    for i, resume in enumerate(resumes):
+        for j, jd in enumerate(jds):
+            assert matrix[i, j] == compute_semantic_match_score(resume, jd)[0]
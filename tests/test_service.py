@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+
+from service import HTTPError, ScoringService, create_app
+from utils import telemetry
+
+
+class BrokenService(ScoringService):
+    async def analyze(self, payload):
+        raise RuntimeError("worker crashed")
+
+    async def batch(self, payload):
+        raise HTTPError(413, "At most 1 resumes per batch")
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics(monkeypatch):
+    monkeypatch.setattr(telemetry, "TELEMETRY_ENABLED", True)
+    telemetry.reset()
+    yield
+    telemetry.reset()
+
+
+def _request(app, method, path, body=b"", send_error=None):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if send_error and message["type"] == "http.response.body":
+            raise send_error
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+def _requests_by_status():
+    return {
+        c["labels"]["status"]: c["value"]
+        for c in telemetry.metrics_json()["counters"] if c["name"] == "service_requests_total"
+    }
+
+
+def test_unhandled_error_returns_json_500(capsys):
+    app = create_app(BrokenService())
+    start, body = _request(app, "POST", "/analyze", b'{"resume_text": "x"}')
+
+    assert start["status"] == 500
+    assert (b"content-type", b"application/json") in start["headers"]
+    assert json.loads(body["body"]) == {"error": "Internal server error"}
+    assert "worker crashed" in capsys.readouterr().err
+    assert _requests_by_status() == {"500": 1}
+
+
+def test_http_errors_keep_their_status():
+    app = create_app(BrokenService())
+    start, body = _request(app, "POST", "/batch", b"{}")
+    assert start["status"] == 413
+    assert json.loads(body["body"]) == {"error": "At most 1 resumes per batch"}
+
+    start, _ = _request(app, "POST", "/analyze", b"not json")
+    assert start["status"] == 400
+    assert _requests_by_status() == {"413": 1, "400": 1}
+
+
+def test_failure_after_response_start_is_counted_once(capsys):
+    app = create_app(BrokenService())
+    messages = _request(app, "GET", "/health", send_error=OSError("client went away"))
+
+    assert [m["type"] for m in messages] == ["http.response.start"]
+    assert _requests_by_status() == {"500": 1}
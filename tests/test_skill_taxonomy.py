@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from utils.match_scorer import compute_skill_match
+from utils.skill_taxonomy import AhoCorasick, SkillTaxonomy, get_taxonomy
+
+SKILLS = [
+    {"name": "python", "category": "Technical", "aliases": ["py"]},
+    {"name": "java", "category": "Technical"},
+    {"name": "javascript", "category": "Technical", "aliases": ["js"]},
+    {"name": "c++", "category": "Technical"},
+    {"name": "machine learning", "category": "Technical", "aliases": ["ml"]},
+    {"name": "ci/cd", "category": "Tools", "aliases": ["continuous integration"]},
+    {"name": "ci", "category": "Tools"},
+    {"name": "docker", "category": "Tools"},
+    {"name": "communication", "category": "Soft"},
+]
+
+
+@pytest.fixture
+def taxonomy():
+    return SkillTaxonomy(SKILLS)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_automaton_finds_every_occurrence(seed):
+    rng = random.Random(seed)
+    patterns = sorted({"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(15)})
+    automaton = AhoCorasick()
+    for pattern in patterns:
+        automaton.add(pattern)
+    automaton.build()
+    text = "".join(rng.choice("abcd") for _ in range(300))
+
+    expected = sorted(
+        (start, start + len(pattern), pattern_id)
+        for pattern_id, pattern in enumerate(patterns)
+        for start in range(len(text))
+        if text.startswith(pattern, start)
+    )
+    assert sorted(automaton.iter_matches(text)) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("JavaScript and TypeScript", {"javascript"}),
+    ("java, python.", {"java", "python"}),
+    ("Happy to learn", set()),
+    ("pyspark", set()),
+    ("(java)", {"java"}),
+    ("java8", set()),
+    ("C++ developer", {"c++"}),
+])
+def test_matches_respect_word_boundaries(taxonomy, text, expected):
+    assert taxonomy.find_skills(text) == expected
+
+
+def test_multi_word_skills_span_any_whitespace(taxonomy):
+    assert taxonomy.find_skills("Built Machine\n   Learning models") == {"machine learning"}
+    assert taxonomy.find_skills("Set up Continuous\tIntegration") == {"ci/cd"}
+
+
+def test_aliases_resolve_to_the_canonical_name(taxonomy):
+    assert taxonomy.find_skills("py, js and ML") == {"python", "javascript", "machine learning"}
+
+
+def test_nested_matches_are_ignored(taxonomy):
+    assert taxonomy.find_skills("Owns the CI/CD pipeline") == {"ci/cd"}
+    assert taxonomy.find_skills("CI/CD and a separate CI job") == {"ci/cd", "ci"}
+
+
+def test_category_coverage_only_counts_categories_the_jd_asks_for(taxonomy):
+    resume = "Python, Docker and great communication"
+    jd = "Python, Java, machine learning and Docker"
+    score, missing, breakdown = compute_skill_match(resume, jd, taxonomy)
+
+    assert missing == ["java", "machine learning"]
+    assert score == 50.0
+    # The JD asks for three Technical skills and one Tools skill; Soft is absent
+    assert breakdown == {"Technical": 33.33, "Tools": 100.0}
+
+
+def test_empty_jd_scores_zero(taxonomy):
+    assert compute_skill_match("python", "", taxonomy) == (0.0, [], {})
+
+
+def test_loads_csv_taxonomy(tmp_path):
+    path = tmp_path / "skills.csv"
+    path.write_text(
+        "name,category,aliases\npython,Technical,py\nmachine learning,Technical,ml\ndocker,,\n",
+        encoding="utf-8",
+    )
+    loaded = SkillTaxonomy.from_file(str(path))
+    assert loaded.category_of("docker") == "Other"
+    assert loaded.find_skills("py and ML on Docker") == {"python", "machine learning", "docker"}
+
+
+def test_default_taxonomy_loads():
+    taxonomy = get_taxonomy()
+    assert taxonomy is get_taxonomy()
+    assert {"python", "machine learning", "ci/cd"} <= taxonomy.find_skills(
+        "Python, machine learning and CI/CD pipelines"
+    )
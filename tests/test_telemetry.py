@@ -0,0 +1,34 @@
+import re
+
+import pytest
+
+from utils import telemetry
+
+# One sample line: name, optional {labels}, value
+SAMPLE = re.compile(r'^(\w+)(?:\{((?:\w+="(?:[^"\\\n]|\\[\\"n])*",?)*)\})? \S+$')
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics(monkeypatch):
+    monkeypatch.setattr(telemetry, "TELEMETRY_ENABLED", True)
+    telemetry.reset()
+    yield
+    telemetry.reset()
+
+
+def test_label_values_are_escaped():
+    value = 'C:\\resumes\\"jane"\ndoe.pdf'
+    telemetry.increment("resumes_total", source=value)
+
+    lines = [line for line in telemetry.render_prometheus().splitlines() if line.startswith("resumes_total")]
+    assert lines == ['resumes_total{source="C:\\\\resumes\\\\\\"jane\\"\\ndoe.pdf"} 1']
+
+
+def test_every_sample_line_parses():
+    telemetry.increment("requests_total", path='/a"b', status="200")
+    telemetry.observe("latency_seconds", 0.2, stage="parse\\pdf")
+    telemetry.observe("latency_seconds", 0.2, stage="line\nbreak")
+
+    for line in telemetry.render_prometheus().splitlines():
+        if not line.startswith("#"):
+            assert SAMPLE.match(line), line
@@ -0,0 +1,16 @@
+def warm_up(spacy_model: bool = True, pdf: bool = True, openai: bool = True, charts: bool = True) -> None:
+    """
+    Loads the heavy dependencies ahead of the first request.
+    Everything is imported lazily otherwise; call this at worker start to move
+    the cost out of the first user-facing analysis.
+    """
+    if spacy_model:
+        from utils.keyword_extractor import get_nlp
+        get_nlp()
+    if pdf:
+        import fitz  # noqa: F401
+    if openai:
+        import openai as _openai  # noqa: F401
+    if charts:
+        import pandas  # noqa: F401
+        import altair  # noqa: F401
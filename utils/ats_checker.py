@@ -1,42 +1,199 @@
-import os
-from typing import List
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 
-def run_ats_checks(resume_text: str) -> tuple:
+class ResumeFeatures:
     """
-    Performs basic ATS compliance checks on the resume.
-    Returns an ATS score and list of warnings if any.
+    Everything the rules look at, computed once per resume: the lowercased
+    text, its whitespace tokens, which substring patterns occur and how often
+    the counted patterns occur.
+    """
+
+    def __init__(self, text: str, lowered: str, tokens: List[str], found: set, counts: Dict[str, int]):
+        self.text = text
+        self.lowered = lowered
+        self.tokens = tokens
+        self.found = found
+        self.counts = counts
+
+
+class ATSRule:
     """
-    warnings = []
-    score = 100
+    Base class for a check. `patterns` are lowercase substrings whose presence
+    the rule needs and `count_patterns` substrings it needs counted; the
+    engine collects them from every rule so each is looked for only once.
+    """
+
+    patterns: Tuple[str, ...] = ()
+    count_patterns: Tuple[str, ...] = ()
+
+    def __init__(self, name: str, warning: str, penalty: int):
+        self.name = name
+        self.warning = warning
+        self.penalty = penalty
+
+    def passes(self, features: ResumeFeatures) -> bool:
+        raise NotImplementedError
+
+
+class MinLengthRule(ATSRule):
+    def __init__(self, name: str, warning: str, penalty: int, min_chars: int):
+        super().__init__(name, warning, penalty)
+        self.min_chars = min_chars
 
-    # Check length
-    if len(resume_text) < 500:
-        warnings.append("Resume content is too short; consider adding more detail.")
-        score -= 20
+    def passes(self, features: ResumeFeatures) -> bool:
+        return len(features.text) >= self.min_chars
 
-    # Check for important sections
-    if not any(keyword in resume_text.lower() for keyword in ["experience", "projects", "education"]):
-        warnings.append("Key sections like 'Experience', 'Projects', or 'Education' are missing.")
-        score -= 15
 
-    # Contact information check
-    if not any(k in resume_text.lower() for k in ["contact", "email", "phone"]):
-        warnings.append("Missing contact information (email or phone).")
-        score -= 10
+class AnyKeywordRule(ATSRule):
+    def __init__(self, name: str, warning: str, penalty: int, keywords: Sequence[str]):
+        super().__init__(name, warning, penalty)
+        self.patterns = tuple(k.lower() for k in keywords)
 
-    # Bullet point usage
-    if resume_text.count("•") < 5:
-        warnings.append("Consider using bullet points for readability.")
-        score -= 5
+    def passes(self, features: ResumeFeatures) -> bool:
+        return any(k in features.found for k in self.patterns)
 
-    # Keyword stuffing check
-    if len(set(resume_text.lower().split())) < len(resume_text.split()) * 0.5:
-        warnings.append("Too many repeated words. Avoid keyword stuffing.")
-        score -= 5
 
-    # File format caution
-    if not resume_text.lower().endswith("pdf"):
-        warnings.append("Use PDF format to avoid parsing issues with ATS.")
+class MinCountRule(ATSRule):
+    def __init__(self, name: str, warning: str, penalty: int, pattern: str, min_count: int):
+        super().__init__(name, warning, penalty)
+        self.count_patterns = (pattern.lower(),)
+        self.min_count = min_count
 
-    return max(score, 0), warnings
\ No newline at end of file
+    def passes(self, features: ResumeFeatures) -> bool:
+        return features.counts.get(self.count_patterns[0], 0) >= self.min_count
+
+
+class RepetitionRule(ATSRule):
+    def __init__(self, name: str, warning: str, penalty: int, min_unique_ratio: float):
+        super().__init__(name, warning, penalty)
+        self.min_unique_ratio = min_unique_ratio
+
+    def passes(self, features: ResumeFeatures) -> bool:
+        return not len(set(features.tokens)) < len(features.tokens) * self.min_unique_ratio
+
+
+class EndsWithRule(ATSRule):
+    def __init__(self, name: str, warning: str, penalty: int, suffix: str):
+        super().__init__(name, warning, penalty)
+        self.suffix = suffix.lower()
+
+    def passes(self, features: ResumeFeatures) -> bool:
+        return features.lowered.endswith(self.suffix)
+
+
+DEFAULT_RULES: List[ATSRule] = [
+    MinLengthRule("length", "Resume content is too short; consider adding more detail.", 20, min_chars=500),
+    AnyKeywordRule(
+        "sections", "Key sections like 'Experience', 'Projects', or 'Education' are missing.", 15,
+        keywords=["experience", "projects", "education"]
+    ),
+    AnyKeywordRule("contact", "Missing contact information (email or phone).", 10, keywords=["contact", "email", "phone"]),
+    MinCountRule("bullets", "Consider using bullet points for readability.", 5, pattern="•", min_count=5),
+    RepetitionRule("repetition", "Too many repeated words. Avoid keyword stuffing.", 5, min_unique_ratio=0.5),
+    EndsWithRule("file_format", "Use PDF format to avoid parsing issues with ATS.", 0, suffix="pdf"),
+]
+
+
+class ATSResult:
+    def __init__(self, score: int, warnings: List[str], failed: List[str], timings: Optional[Dict[str, float]]):
+        self.score = score
+        self.warnings = warnings
+        self.failed = failed
+        self.timings = timings
+
+
+class ATSRuleEngine:
+    """
+    Compiles a ruleset once: every presence pattern goes into one regex, so
+    each resume is lowercased, split and scanned a single time (stopping as
+    soon as all patterns are seen) before the rules run on the shared features.
+    """
+
+    def __init__(self, rules: Sequence[ATSRule] = DEFAULT_RULES, base_score: int = 100):
+        self.rules = list(rules)
+        self.base_score = base_score
+
+        self._presence = sorted({p for rule in self.rules for p in rule.patterns}, key=lambda p: (-len(p), p))
+        self._count_patterns = sorted({p for rule in self.rules for p in rule.count_patterns})
+        self._scanner = (
+            re.compile("|".join(re.escape(p) for p in self._presence)) if self._presence else None
+        )
+        # A non-overlapping scan can hide a pattern that overlaps an earlier
+        # match; those are confirmed with a plain substring test afterwards
+        self._may_overlap = _patterns_may_overlap(self._presence)
+
+    def extract_features(self, resume_text: str) -> ResumeFeatures:
+        lowered = resume_text.lower()
+        tokens = lowered.split()
+        found = set()
+
+        if self._scanner is not None:
+            for match in self._scanner.finditer(lowered):
+                found.add(match.group())
+                if len(found) == len(self._presence):
+                    break
+            if self._may_overlap and len(found) < len(self._presence):
+                found.update(p for p in self._presence if p not in found and p in lowered)
+
+        counts = {p: lowered.count(p) for p in self._count_patterns}
+        return ResumeFeatures(resume_text, lowered, tokens, found, counts)
+
+    def evaluate(self, resume_text: str, timings: bool = False) -> ATSResult:
+        """
+        Runs every rule on one resume. With timings=True, returns seconds spent
+        on feature extraction ("_features") and on each rule.
+        """
+        rule_timings = {} if timings else None
+        start = time.perf_counter()
+        features = self.extract_features(resume_text)
+        if timings:
+            rule_timings["_features"] = time.perf_counter() - start
+
+        score = self.base_score
+        warnings = []
+        failed = []
+        for rule in self.rules:
+            rule_start = time.perf_counter() if timings else 0.0
+            ok = rule.passes(features)
+            if timings:
+                rule_timings[rule.name] = time.perf_counter() - rule_start
+            if not ok:
+                failed.append(rule.name)
+                warnings.append(rule.warning)
+                score -= rule.penalty
+
+        return ATSResult(max(score, 0), warnings, failed, rule_timings)
+
+    def evaluate_many(self, resume_texts: Iterable[str], timings: bool = False) -> List[ATSResult]:
+        return [self.evaluate(text, timings) for text in resume_texts]
+
+
+def _patterns_may_overlap(patterns: Sequence[str]) -> bool:
+    for p in patterns:
+        for q in patterns:
+            if p == q:
+                continue
+            if q in p or any(p.endswith(q[:i]) for i in range(1, len(q))):
+                return True
+    return False
+
+
+_default_engine = ATSRuleEngine()
+
+
+def run_ats_checks(resume_text: str) -> tuple:
+    """
+    Performs basic ATS compliance checks on the resume.
+    Returns an ATS score and list of warnings if any.
+    """
+    result = _default_engine.evaluate(resume_text)
+    return result.score, result.warnings
+
+
+def run_ats_checks_batch(resume_texts: Iterable[str], timings: bool = False) -> List[ATSResult]:
+    """
+    Batch variant of run_ats_checks over a whole resume collection.
+    """
+    return _default_engine.evaluate_many(resume_texts, timings)
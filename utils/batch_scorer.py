@@ -0,0 +1,245 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from utils.match_scorer import CATEGORY_KEYWORDS
+
+# Python's round() is correctly rounded, np.round() is not; keep results identical
+_round = np.frompyfunc(round, 2, 1)
+
+
+class KeywordVocabulary:
+    """
+    Interns keyword strings into dense integer ids shared by resumes and JDs.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def intern(self, term: str) -> int:
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.ids[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def intern_all(self, terms: Iterable[str]) -> np.ndarray:
+        return np.array(sorted(self.intern(t) for t in terms), dtype=np.int64)
+
+
+def build_keyword_matrix(id_rows: Sequence[np.ndarray], n_terms: int) -> sparse.csr_matrix:
+    """
+    Builds a binary document x keyword CSR matrix from per-document id arrays.
+    """
+    indptr = np.zeros(len(id_rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(ids) for ids in id_rows])
+    indices = np.concatenate(id_rows) if id_rows else np.zeros(0, dtype=np.int64)
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(id_rows), n_terms))
+
+
+def rounded_percent(counts: np.ndarray, totals) -> np.ndarray:
+    """
+    counts / totals as percentages, rounded exactly like compute_match_score.
+    """
+    return _round(counts / totals * 100, 2).astype(np.float64)
+
+
+class BatchMatchResult:
+    """
+    Match scores, missing keywords and category breakdowns for every
+    resume x JD pair. Entry (i, j) equals compute_match_score(resume_i, jd_j).
+    """
+
+    def __init__(self, vocab, resume_sets, jd_sets, resume_matrix, jd_matrix,
+                 overlap, scores, category_breakdown):
+        self.vocab = vocab
+        self.resume_sets = resume_sets
+        self.jd_sets = jd_sets
+        self.resume_matrix = resume_matrix
+        self.jd_matrix = jd_matrix
+        self.overlap = overlap
+        self.scores = scores
+        self.category_breakdown = category_breakdown
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.scores.shape
+
+    @property
+    def missing_counts(self) -> np.ndarray:
+        jd_sizes = np.asarray(self.jd_matrix.sum(axis=1)).ravel()
+        return jd_sizes[np.newaxis, :] - self.overlap
+
+    def missing_matrix(self, resume_index: int) -> sparse.csr_matrix:
+        """
+        JD x keyword matrix of the keywords each JD has that resume `resume_index` lacks.
+        """
+        resume_row = self.resume_matrix[resume_index]
+        return (self.jd_matrix - self.jd_matrix.multiply(resume_row)).tocsr()
+
+    def missing_keywords(self, resume_index: int, jd_index: int) -> List[str]:
+        # Same set expression as compute_match_score so the list order matches too
+        return list(self.jd_sets[jd_index] - self.resume_sets[resume_index])
+
+    def breakdown(self, resume_index: int, jd_index: int) -> Dict[str, float]:
+        return {
+            category: float(values[resume_index, jd_index])
+            for category, values in self.category_breakdown.items()
+        }
+
+    def result(self, resume_index: int, jd_index: int) -> Tuple[float, List[str], Dict[str, float]]:
+        return (
+            float(self.scores[resume_index, jd_index]),
+            self.missing_keywords(resume_index, jd_index),
+            self.breakdown(resume_index, jd_index),
+        )
+
+
+def compute_match_matrix(
+    resume_keyword_lists: Sequence[List[str]],
+    jd_keyword_lists: Sequence[List[str]]
+) -> BatchMatchResult:
+    """
+    Scores every resume against every JD at once using sparse matrix products.
+    """
+    resume_sets = [set([kw.lower() for kw in kws]) for kws in resume_keyword_lists]
+    jd_sets = [set([kw.lower() for kw in kws]) for kws in jd_keyword_lists]
+
+    vocab = KeywordVocabulary()
+    resume_ids = [vocab.intern_all(s) for s in resume_sets]
+    jd_ids = [vocab.intern_all(s) for s in jd_sets]
+
+    resume_matrix = build_keyword_matrix(resume_ids, len(vocab))
+    jd_matrix = build_keyword_matrix(jd_ids, len(vocab))
+    jd_t = jd_matrix.T.tocsc()
+
+    overlap = np.asarray((resume_matrix @ jd_t).todense(), dtype=np.int64)
+    jd_sizes = np.array([len(s) for s in jd_sets], dtype=np.int64)
+    scores = rounded_percent(overlap, np.maximum(jd_sizes, 1)[np.newaxis, :])
+
+    category_breakdown = {}
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        total = len(keywords)
+        if not total:
+            category_breakdown[category] = np.zeros(overlap.shape)
+            continue
+        mask = np.zeros(len(vocab), dtype=np.int32)
+        mask[[vocab.ids[kw] for kw in set(keywords) if kw in vocab.ids]] = 1
+        counts = resume_matrix.multiply(mask[np.newaxis, :]).tocsr() @ jd_t
+        category_breakdown[category] = rounded_percent(
+            np.asarray(counts.todense(), dtype=np.int64), total
+        )
+
+    return BatchMatchResult(
+        vocab, resume_sets, jd_sets, resume_matrix, jd_matrix,
+        overlap, scores, category_breakdown
+    )
+
+
+def collect_files(paths: List[str], extensions: Tuple[str, ...]) -> List[str]:
+    """
+    Expands directories to their files with the given extensions, sorted; files pass through.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(extensions):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+
+def _load_resumes(paths: List[str]) -> Tuple[List[str], List[str]]:
+    from utils.resume_parser import extract_many
+
+    texts = {}
+    pdf_paths = [p for p in paths if p.lower().endswith(".pdf")]
+    for result in extract_many(pdf_paths):
+        if result["error"]:
+            print(f"Skipping {result['source']}: {result['error']['message']}", file=sys.stderr)
+        else:
+            texts[result["source"]] = result["text"]
+    for path in paths:
+        if not path.lower().endswith(".pdf"):
+            with open(path, encoding="utf-8") as f:
+                texts[path] = f.read()
+
+    loaded = [p for p in paths if p in texts]
+    return loaded, [texts[p] for p in loaded]
+
+
+def load_jd(path: str) -> str:
+    """
+    Reads and cleans a job description file.
+    """
+    from utils.jd_parser import clean_job_description
+
+    with open(path, encoding="utf-8") as f:
+        return clean_job_description(f.read())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score many resumes against many job descriptions.")
+    parser.add_argument("--resumes", nargs="+", required=True, help="Resume files (.pdf/.txt) or directories")
+    parser.add_argument("--jds", nargs="+", required=True, help="Job description .txt files or directories")
+    parser.add_argument("--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--batch-size", type=int, default=64, help="spaCy nlp.pipe batch size")
+    parser.add_argument("--n-process", type=int, default=1, help="spaCy worker processes")
+    args = parser.parse_args(argv)
+
+    from utils.keyword_extractor import extract_keywords_bulk
+
+    resume_paths, resume_texts = _load_resumes(collect_files(args.resumes, (".pdf", ".txt")))
+    jd_paths = collect_files(args.jds, (".txt",))
+    resume_keywords = list(extract_keywords_bulk(
+        resume_texts, batch_size=args.batch_size, n_process=args.n_process
+    ))
+    jd_keywords = list(extract_keywords_bulk(
+        (load_jd(p) for p in jd_paths), batch_size=args.batch_size, n_process=args.n_process
+    ))
+
+    result = compute_match_matrix(resume_keywords, jd_keywords)
+    categories = list(CATEGORY_KEYWORDS)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        if args.format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(["resume", "jd", "match_score"] + categories + ["missing_keywords"])
+        for i, resume_path in enumerate(resume_paths):
+            for j, jd_path in enumerate(jd_paths):
+                score, missing, breakdown = result.result(i, j)
+                if args.format == "csv":
+                    writer.writerow([resume_path, jd_path, score]
+                                    + [breakdown[c] for c in categories]
+                                    + [";".join(sorted(missing))])
+                else:
+                    out.write(json.dumps({
+                        "resume": resume_path,
+                        "jd": jd_path,
+                        "match_score": score,
+                        "missing_keywords": sorted(missing),
+                        "category_breakdown": breakdown,
+                    }) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
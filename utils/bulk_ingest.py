@@ -0,0 +1,331 @@
+"""
+Streaming bulk ingest of a resume folder or ZIP archive.
+
+    python -m utils.bulk_ingest applications.zip --jds jds/ --output results.jsonl
+    python -m utils.bulk_ingest resumes/ --jds jd.txt --output results.csv --format csv
+
+Stages run concurrently and are connected by bounded queues:
+
+    walk dir / ZIP -> PDF extraction (process pool) -> ATS + keywords + scoring (process pool) -> writer
+
+Every stage keeps input order, so progress is a single count. After each
+batch is flushed the count and output size go to <output>.checkpoint, and
+rerunning the same command resumes after the last flushed document.
+Memory is bounded by the queue sizes and pool windows, not the archive size.
+"""
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from utils.resume_parser import ordered_map
+
+QUEUE_SIZE = 64
+_DONE = object()
+
+# Set in analysis workers by _init_analysis
+_JD_KEYWORDS: List[List[str]] = []
+_USE_GPT = False
+
+
+def iter_sources(path: str) -> Iterator[Tuple[str, Callable[[], bytes]]]:
+    """
+    Yields (source_id, read_bytes) for every PDF under a directory or inside
+    a ZIP, in a stable sorted order. Bytes are only read when asked for.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            names = sorted(
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(".pdf")
+                and not os.path.basename(info.filename).startswith(".")
+            )
+            for name in names:
+                yield f"{path}:{name}", (lambda name=name: archive.read(name))
+        return
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                full = os.path.join(root, name)
+                yield full, (lambda full=full: _read_file(full))
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _in_thread(items: Iterable, name: str, maxsize: int = QUEUE_SIZE) -> Iterator:
+    """
+    Drives an iterator on its own thread through a bounded queue, so the
+    stage keeps working while the consumer is busy.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    failure = []
+
+    def run():
+        try:
+            for item in items:
+                buffer.put(item)
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            buffer.put(_DONE)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is _DONE:
+            if failure:
+                raise failure[0]
+            return
+        yield item
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _extract(task: Tuple[str, bytes]) -> dict:
+    from utils.resume_parser import extract_document
+
+    source, data = task
+    result = extract_document(data)
+    result["source"] = source
+    return result
+
+
+def _init_analysis(jd_keywords: List[List[str]], use_gpt: bool) -> None:
+    global _JD_KEYWORDS, _USE_GPT
+    from utils import warm_up
+
+    warm_up(spacy_model=True, pdf=False, openai=False, charts=False)
+    _JD_KEYWORDS, _USE_GPT = jd_keywords, use_gpt
+
+
+def _analyze_batch(extracted: List[dict]) -> List[dict]:
+    from utils.ats_checker import run_ats_checks_batch
+    from utils.batch_scorer import compute_match_matrix
+    from utils.keyword_extractor import extract_keywords_bulk
+
+    ok = [doc for doc in extracted if not doc["error"]]
+    texts = [doc["text"] for doc in ok]
+    ats_results = run_ats_checks_batch(texts)
+    keywords = list(extract_keywords_bulk(texts, use_gpt=_USE_GPT))
+    matches = compute_match_matrix(keywords, _JD_KEYWORDS) if ok and _JD_KEYWORDS else None
+
+    rows = []
+    analyzed = iter(range(len(ok)))
+    for doc in extracted:
+        row = {"source": doc["source"], "pages": doc["pages"], "truncated": doc["truncated"], "error": doc["error"]}
+        if not doc["error"]:
+            i = next(analyzed)
+            row["ats_score"] = ats_results[i].score
+            row["ats_failed"] = ats_results[i].failed
+            row["matches"] = [
+                {"score": float(matches.scores[i, j]), "missing_keywords": sorted(matches.missing_keywords(i, j))}
+                for j in range(len(_JD_KEYWORDS))
+            ] if matches is not None else []
+        rows.append(row)
+    return rows
+
+
+def jd_column_names(jd_paths: List[str]) -> List[str]:
+    """
+    Names for the per-JD result columns: file basenames, or paths relative
+    to the JDs' common directory when two basenames collide.
+    """
+    names = [os.path.basename(p) for p in jd_paths]
+    if len(set(names)) == len(names):
+        return names
+    full = [os.path.abspath(p) for p in jd_paths]
+    base = os.path.commonpath([os.path.dirname(p) for p in full])
+    names = [os.path.relpath(p, base) for p in full]
+    # The same file listed twice still needs distinct columns
+    seen = {}
+    for i, name in enumerate(names):
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            names[i] = f"{name}#{seen[name]}"
+    return names
+
+
+class _Writer:
+    """
+    Appends result rows as JSONL or CSV and records a checkpoint after each flush.
+    """
+
+    def __init__(self, output: str, fmt: str, source: str, jd_names: List[str], overwrite: bool = False):
+        self.output = output
+        self.fmt = fmt
+        self.source = os.path.abspath(source)
+        self.jd_names = jd_names
+        self.checkpoint_path = output + ".checkpoint"
+        self.done = 0
+
+        output_bytes = None
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            matches = checkpoint["source"] == self.source and checkpoint["jds"] == jd_names
+            # A shorter output lost flushed rows (replaced or truncated); resuming would skip them
+            if matches and os.path.exists(output) and os.path.getsize(output) >= checkpoint["output_bytes"]:
+                self.done, output_bytes = checkpoint["done"], checkpoint["output_bytes"]
+        if output_bytes is None:
+            # Not resuming: never clobber results this run didn't write
+            if os.path.exists(output) and os.path.getsize(output) and not overwrite:
+                raise FileExistsError(
+                    f"{output} exists and has no usable checkpoint for this source and JD list; "
+                    "pass --overwrite to replace it"
+                )
+            output_bytes = 0
+
+        # Drop anything written after the last checkpoint
+        self.file = open(output, "a+b")
+        self.file.truncate(output_bytes)
+        self.file.seek(output_bytes)
+        self.text = io.TextIOWrapper(self.file, encoding="utf-8", newline="", write_through=True)
+        if fmt == "csv":
+            self.csv = csv.writer(self.text)
+            if output_bytes == 0:
+                self.csv.writerow(["source", "error", "pages", "ats_score", "ats_failed"] + jd_names)
+
+    def write(self, rows: List[dict]) -> None:
+        for row in rows:
+            if self.fmt == "csv":
+                error = row["error"]["message"] if row["error"] else ""
+                scores = [m["score"] for m in row.get("matches", [])] or [""] * len(self.jd_names)
+                self.csv.writerow(
+                    [row["source"], error, row["pages"], row.get("ats_score", ""), ";".join(row.get("ats_failed", []))]
+                    + scores
+                )
+            else:
+                if row.get("matches"):
+                    row["matches"] = dict(zip(self.jd_names, row["matches"]))
+                self.text.write(json.dumps(row) + "\n")
+        self.text.flush()
+        os.fsync(self.file.fileno())
+        self.done += len(rows)
+        self._save_checkpoint()
+
+    def _save_checkpoint(self) -> None:
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"source": self.source, "jds": self.jd_names, "done": self.done,
+                       "output_bytes": self.file.tell()}, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def close(self) -> None:
+        self.text.close()
+
+
+def run_ingest(
+    source: str,
+    output: str,
+    jd_paths: List[str],
+    fmt: str = "jsonl",
+    extract_workers: Optional[int] = None,
+    analysis_workers: int = 1,
+    batch_size: int = 32,
+    use_gpt: bool = False,
+    progress: bool = True,
+    overwrite: bool = False
+) -> int:
+    """
+    Runs the pipeline over `source` and returns the number of documents
+    written in this run (not counting ones skipped from the checkpoint).
+    An existing output without a matching checkpoint raises FileExistsError
+    unless `overwrite` is set.
+    """
+    from utils.batch_scorer import load_jd
+    from utils.keyword_extractor import extract_keywords_bulk
+
+    jd_names = jd_column_names(jd_paths)
+    jd_keywords = list(extract_keywords_bulk((load_jd(p) for p in jd_paths), use_gpt=use_gpt))
+    writer = _Writer(output, fmt, source, jd_names, overwrite)
+    skip = writer.done
+
+    extract_workers = extract_workers or os.cpu_count() or 1
+    # spawn: the stage threads make forking unsafe
+    context = multiprocessing.get_context("spawn")
+    extract_pool = ProcessPoolExecutor(max_workers=extract_workers, mp_context=context)
+    analysis_pool = ProcessPoolExecutor(
+        max_workers=analysis_workers, mp_context=context,
+        initializer=_init_analysis, initargs=(jd_keywords, use_gpt),
+    )
+
+    written = 0
+    start = time.perf_counter()
+    last_report = start
+    try:
+        sources = islice(iter_sources(source), skip, None)
+        tasks = ((source_id, read()) for source_id, read in sources)
+        extracted = _in_thread(ordered_map(extract_pool, _extract, tasks, 2 * extract_workers), "ingest-extract")
+        analyzed = _in_thread(
+            ordered_map(analysis_pool, _analyze_batch, _batched(extracted, batch_size), 2 * analysis_workers),
+            "ingest-analyze", maxsize=4,
+        )
+        for rows in analyzed:
+            writer.write(rows)
+            written += len(rows)
+            now = time.perf_counter()
+            if progress and now - last_report >= 1.0:
+                last_report = now
+                print(f"\r{skip + written} docs · {written / (now - start):.1f} docs/s", end="", file=sys.stderr)
+    finally:
+        writer.close()
+        extract_pool.shutdown(wait=False, cancel_futures=True)
+        analysis_pool.shutdown(wait=False, cancel_futures=True)
+
+    if progress:
+        elapsed = time.perf_counter() - start
+        rate = written / elapsed if elapsed else 0.0
+        print(f"\r{skip + written} docs · {rate:.1f} docs/s · done ({skip} from checkpoint)", file=sys.stderr)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest a folder or ZIP of resume PDFs.")
+    parser.add_argument("source", help="Directory or .zip of resume PDFs")
+    parser.add_argument("--jds", nargs="*", default=[], help="Job description .txt files or directories")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Default: from --output extension")
+    parser.add_argument("--extract-workers", type=int, default=None, help="PDF extraction processes")
+    parser.add_argument("--analysis-workers", type=int, default=1, help="ATS/keyword/scoring processes")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--gpt-fallback", action="store_true", help="Use GPT when spaCy finds no keywords")
+    parser.add_argument("--overwrite", action="store_true", help="Replace an output that has no matching checkpoint")
+    args = parser.parse_args(argv)
+
+    from utils.batch_scorer import collect_files
+
+    fmt = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    try:
+        run_ingest(
+            args.source, args.output, collect_files(args.jds, (".txt",)), fmt,
+            args.extract_workers, args.analysis_workers, args.batch_size, args.gpt_fallback,
+            overwrite=args.overwrite,
+        )
+    except FileExistsError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import copy
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils import telemetry
+
+# Bump whenever parsing, cleaning or extraction output changes so stale entries are ignored
+PIPELINE_VERSION = "3"
+
+DEFAULT_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", os.path.join(".cache", "matchmyresume"))
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+
+_MISSING = object()
+
+
+def _copy(value):
+    # Cached values are JSON data; strings and numbers are immutable already
+    return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+
+
+def content_key(namespace: str, data) -> str:
+    """
+    Hashes content together with the namespace and pipeline version.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    digest = hashlib.sha256()
+    digest.update(f"{namespace}:{PIPELINE_VERSION}:".encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class ContentCache:
+    """
+    Two-tier cache: an in-process LRU backed by JSON files on disk.
+    The disk tier evicts least recently used files once it exceeds max_disk_bytes.
+    Values go in and come out as copies, so callers can't mutate cached entries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES
+    ):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return _copy(self._memory[key])
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is _MISSING:
+                self.counters["misses"] += 1
+                return default
+            self.counters["disk_hits"] += 1
+            self._memory_put(key, _copy(value))
+        return value
+
+    def put(self, key: str, value) -> None:
+        with self._lock:
+            self._memory_put(key, _copy(value))
+        self._disk_put(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], object], should_store: Callable = None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            if should_store is None or should_store(value):
+                self.put(key, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.counters)
+            stats["memory_entries"] = len(self._memory)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self.cache_dir and os.path.isdir(self.cache_dir):
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith(".json"):
+                        os.remove(entry.path)
+            self._disk_bytes = 0
+
+    def _memory_put(self, key: str, value) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _disk_get(self, key: str):
+        if not self.cache_dir:
+            return _MISSING
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # mark as recently used for eviction
+            return value
+        except (OSError, ValueError):
+            return _MISSING
+
+    def _disk_put(self, key: str, value) -> None:
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            payload = json.dumps(value).encode("utf-8")
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Cache write error: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(payload)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(
+            entry.stat().st_size for entry in os.scandir(self.cache_dir)
+            if entry.name.endswith(".json")
+        )
+
+    def _evict_disk(self) -> None:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% so every put past the limit doesn't rescan the directory
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ContentCache:
+    """
+    Returns the process-wide cache used by the cached_* helpers.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ContentCache()
+    return _cache
+
+
+def _metrics():
+    if _cache is None:
+        return []
+    stats = _cache.stats()
+    return [
+        ("content_cache_hits", {"tier": "memory"}, stats["memory_hits"]),
+        ("content_cache_hits", {"tier": "disk"}, stats["disk_hits"]),
+        ("content_cache_misses", {}, stats["misses"]),
+        ("content_cache_memory_entries", {}, stats["memory_entries"]),
+    ]
+
+
+telemetry.register_collector(_metrics)
+
+
+def cached_resume_text(resume_file, cache: ContentCache = None) -> str:
+    """
+    Cached extract_resume_text keyed by the PDF bytes.
+    PDFExtractionError propagates and nothing is cached for unreadable files.
+    """
+    from utils.resume_parser import extract_resume_text
+
+    cache = cache or get_cache()
+    data = resume_file.getvalue() if hasattr(resume_file, "getvalue") else resume_file.read()
+    return cache.get_or_compute(
+        content_key("resume_text", data),
+        lambda: extract_resume_text(io.BytesIO(data)),
+    )
+
+
+def cached_clean_job_description(jd_text: str, cache: ContentCache = None) -> str:
+    """
+    Cached clean_job_description keyed by the raw JD text.
+    """
+    from utils.jd_parser import clean_job_description
+
+    cache = cache or get_cache()
+    return cache.get_or_compute(
+        content_key("clean_jd", jd_text),
+        lambda: clean_job_description(jd_text),
+        should_store=lambda text: not text.startswith("Error cleaning job description"),
+    )
+
+
+def cached_keywords_bulk(texts: Iterable[str], cache: ContentCache = None, **kwargs) -> List[List[str]]:
+    """
+    Cached extract_keywords_bulk: only texts not already in the cache are sent through spaCy.
+    """
+    from utils.keyword_extractor import USE_GPT_FALLBACK, extract_keywords_bulk
+
+    cache = cache or get_cache()
+    texts = list(texts)
+    use_gpt = kwargs.get("use_gpt", USE_GPT_FALLBACK)
+    namespace = "keywords+gpt" if use_gpt else "keywords"
+    keys = [content_key(namespace, text) for text in texts]
+    results = [cache.get(key, _MISSING) for key in keys]
+
+    pending = [i for i, value in enumerate(results) if value is _MISSING]
+    if pending:
+        extracted = extract_keywords_bulk((texts[i] for i in pending), **kwargs)
+        for i, keywords in zip(pending, extracted):
+            results[i] = keywords
+            # An empty result may be a transient GPT fallback failure; don't pin it
+            if keywords or not use_gpt:
+                cache.put(keys[i], keywords)
+    return results
+
+
+def cached_keywords(text: str, cache: ContentCache = None, **kwargs) -> List[str]:
+    """
+    Cached extract_keywords for a single text.
+    """
+    return cached_keywords_bulk([text], cache=cache, **kwargs)[0]
@@ -0,0 +1,130 @@
+import os
+import re
+from typing import List, Optional
+
+from utils.llm_cache import LLM_CACHE_ENABLED
+from utils.tokens import count_message_tokens, truncate_to_tokens
+
+CHAT_TOKEN_BUDGET = int(os.getenv("CHAT_TOKEN_BUDGET", "2000"))
+CHAT_PINNED_TOKENS = 400
+CHAT_SUMMARY_TOKENS = 250
+CHAT_MIN_RECENT_TURNS = 2
+
+_SECTION_HEADERS = ("experience", "projects", "education", "skills", "summary", "certifications")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def resume_facts(resume_text: str, review: Optional[str] = None, max_tokens: int = CHAT_PINNED_TOKENS) -> str:
+    """
+    Compact stand-in for the resume in chat context: headline, sections,
+    recognised skills and the start of the initial review, capped at max_tokens.
+    """
+    from utils.skill_taxonomy import get_taxonomy
+
+    lines = [line.strip() for line in resume_text.splitlines() if line.strip()]
+    sections = [line for line in lines if line.lower().rstrip(":") in _SECTION_HEADERS]
+    facts = []
+    if lines:
+        facts.append(f"Candidate: {lines[0]}")
+    if sections:
+        facts.append(f"Sections: {', '.join(sections)}")
+    skills = sorted(get_taxonomy().find_skills(resume_text))
+    if skills:
+        facts.append(f"Skills: {', '.join(skills)}")
+    if review:
+        facts.append(f"Initial review: {review}")
+    return truncate_to_tokens("Resume facts:\n" + "\n".join(facts), max_tokens)
+
+
+def _extractive_summary(turns: List[dict]) -> str:
+    # Used when the summary request fails: first sentence of each turn
+    return " ".join(f"{t['role']}: {_SENTENCE_END.split(t['content'].strip(), 1)[0]}" for t in turns)
+
+
+class ChatContext:
+    """
+    Chat history kept within a token budget. The system prompt and pinned
+    context (resume facts) are always sent; the most recent turns fill the
+    rest of the budget, and turns that no longer fit are folded into a
+    running summary once, not resent verbatim every turn.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        pinned: str = "",
+        budget: int = CHAT_TOKEN_BUDGET,
+        min_recent_turns: int = CHAT_MIN_RECENT_TURNS,
+        use_cache: bool = LLM_CACHE_ENABLED
+    ):
+        self.system_prompt = system_prompt
+        self.pinned = pinned
+        self.budget = budget
+        self.min_recent_turns = min_recent_turns
+        self.use_cache = use_cache
+        self.summary = ""
+        self.turns: List[dict] = []
+
+    def add(self, role: str, content: str) -> None:
+        self.turns.append({"role": role, "content": content})
+
+    def _head(self) -> List[dict]:
+        content = self.system_prompt
+        if self.pinned:
+            content += "\n\n" + self.pinned
+        if self.summary:
+            content += "\n\nSummary of the earlier conversation:\n" + self.summary
+        return [{"role": "system", "content": content}]
+
+    def messages(self) -> List[dict]:
+        """
+        Messages for the next request. Compacts older turns first when the
+        full history would exceed the budget.
+        """
+        if count_message_tokens(self._head() + self.turns) > self.budget:
+            self._compact()
+        return self._head() + list(self.turns)
+
+    def _compact(self) -> None:
+        # Keep recent turns up to half the space left after the head, so the
+        # next several turns fit before another summary request is needed
+        room = (self.budget - count_message_tokens(self._head())) // 2
+        keep = 0
+        used = 0
+        for turn in reversed(self.turns):
+            cost = count_message_tokens([turn])
+            if keep >= self.min_recent_turns and used + cost > room:
+                break
+            keep += 1
+            used += cost
+
+        evicted, self.turns = self.turns[:len(self.turns) - keep], self.turns[len(self.turns) - keep:]
+        if evicted:
+            self.summary = self._summarize(evicted)
+
+    def _summarize(self, evicted: List[dict]) -> str:
+        from utils.llm_client import complete_text
+
+        transcript = "\n".join(f"{t['role']}: {t['content']}" for t in evicted)
+        prompt = (
+            "Update the summary of a conversation about improving a resume. Keep concrete facts, "
+            "requests and advice given; drop pleasantries. Answer with the summary only.\n\n"
+            f"Current summary:\n{self.summary or '(none)'}\n\n"
+            f"New messages:\n{transcript}"
+        )
+        try:
+            # Cached: re-running the app over the same history doesn't summarize twice
+            summary = complete_text(
+                [{"role": "user", "content": prompt}],
+                temperature=0,
+                max_tokens=CHAT_SUMMARY_TOKENS,
+                call_site="chat_summary",
+                use_cache=self.use_cache
+            )
+        except Exception as e:
+            print(f"Chat summary error: {e}")
+            summary = (self.summary + " " + _extractive_summary(evicted)).strip()
+        return truncate_to_tokens(summary, CHAT_SUMMARY_TOKENS)
+
+    def token_count(self) -> int:
+        return count_message_tokens(self._head() + self.turns)
@@ -0,0 +1,2 @@
+# Shared settings with no imports, so light modules (tokens) don't pull in the LLM client
+DEFAULT_MODEL = "gpt-3.5-turbo"
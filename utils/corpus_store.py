@@ -0,0 +1,348 @@
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+STORE_VERSION = 2
+
+# Column files; each holds one flat little-endian array
+_COLUMNS = {
+    "keyword_offsets": np.int64,  # n_docs + 1 offsets into keyword_ids
+    "keyword_ids": np.int32,      # sorted vocabulary ids, concatenated per document
+    "text_offsets": np.int64,     # n_docs + 1 byte offsets into text.bin
+    "source_offsets": np.int64,   # n_docs + 1 byte offsets into sources.bin
+    "ats_score": np.uint8,
+    "ats_failed": np.uint32,      # bitmask over meta["ats_rules"]
+}
+
+
+class CorpusStore:
+    """
+    Append-only columnar store of processed documents: source, extracted
+    text, ATS result and keyword set. Keywords are interned into a shared
+    vocabulary and kept as int32 ids with CSR-style offsets, so the whole
+    store loads as memory-mapped arrays and a scipy CSR matrix without
+    building any Python sets.
+
+    Columns are appended first and meta.json is rewritten last, so a crash
+    mid-append leaves the previous committed state readable.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("version") != STORE_VERSION:
+                raise ValueError(f"Unsupported corpus store version: {self.meta.get('version')}")
+        else:
+            from utils.ats_checker import DEFAULT_RULES
+
+            self.meta = {
+                "version": STORE_VERSION,
+                "documents": 0,
+                "keywords": 0,
+                "text_bytes": 0,
+                "vocabulary": 0,
+                "vocab_bytes": 0,
+                "sources_bytes": 0,
+                "ats_rules": [rule.name for rule in DEFAULT_RULES],
+            }
+            self._write_column("keyword_offsets", np.zeros(1, dtype=np.int64), "wb")
+            self._write_column("text_offsets", np.zeros(1, dtype=np.int64), "wb")
+            self._write_column("source_offsets", np.zeros(1, dtype=np.int64), "wb")
+            self._commit()
+
+        self._vocab: Optional[List[str]] = None
+        self._vocab_ids: Optional[Dict[str, int]] = None
+        self._maps: Dict[str, np.ndarray] = {}
+        self._blobs: Dict[str, np.ndarray] = {}
+        self._checked_tail = False
+
+    def __len__(self) -> int:
+        return self.meta["documents"]
+
+    # Files
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _write_column(self, name: str, values: np.ndarray, mode: str = "ab") -> None:
+        with open(self._file(name + ".bin"), mode) as f:
+            np.ascontiguousarray(values, dtype=_COLUMNS[name]).tofile(f)
+
+    def _column_length(self, name: str) -> int:
+        counts = {
+            "keyword_offsets": self.meta["documents"] + 1,
+            "keyword_ids": self.meta["keywords"],
+            "text_offsets": self.meta["documents"] + 1,
+            "source_offsets": self.meta["documents"] + 1,
+            "ats_score": self.meta["documents"],
+            "ats_failed": self.meta["documents"],
+        }
+        return counts[name]
+
+    def _commit(self) -> None:
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp, self._file("meta.json"))
+
+    def _rollback_uncommitted(self) -> None:
+        # Drops bytes written by an append that never reached _commit
+        sizes = {name + ".bin": self._column_length(name) * np.dtype(dtype).itemsize for name, dtype in _COLUMNS.items()}
+        sizes["text.bin"] = self.meta["text_bytes"]
+        sizes["vocab.txt"] = self.meta["vocab_bytes"]
+        sizes["sources.bin"] = self.meta["sources_bytes"]
+        for name, size in sizes.items():
+            path = self._file(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    # Vocabulary
+
+    @staticmethod
+    def _read_lines(path: str, count: int) -> List[str]:
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8", newline="\n") as f:
+            return f.read().split("\n")[:count]
+
+    @property
+    def vocabulary(self) -> List[str]:
+        if self._vocab is None:
+            self._vocab = self._read_lines(self._file("vocab.txt"), self.meta["vocabulary"])
+        return self._vocab
+
+    @property
+    def vocabulary_ids(self) -> Dict[str, int]:
+        if self._vocab_ids is None:
+            self._vocab_ids = {term: i for i, term in enumerate(self.vocabulary)}
+        return self._vocab_ids
+
+    # Appending
+
+    def append(self, documents: Iterable[dict]) -> int:
+        """
+        Appends documents given as {source, text, ats_score, ats_failed, keywords}
+        (ats_failed is a list of rule names) and commits them in one step.
+        Returns the number appended.
+        """
+        if not self._checked_tail:
+            self._rollback_uncommitted()
+            self._checked_tail = True
+        vocab_ids = self.vocabulary_ids
+        vocab = self.vocabulary
+        rule_bits = {name: 1 << i for i, name in enumerate(self.meta["ats_rules"])}
+
+        new_terms, sources, scores, failed, id_rows, texts = [], [], [], [], [], []
+        for doc in documents:
+            ids = []
+            for keyword in set(" ".join(kw.lower().split()) for kw in doc["keywords"]):
+                term_id = vocab_ids.get(keyword)
+                if term_id is None:
+                    term_id = vocab_ids[keyword] = len(vocab)
+                    vocab.append(keyword)
+                    new_terms.append(keyword)
+                ids.append(term_id)
+            id_rows.append(np.array(sorted(ids), dtype=np.int32))
+            sources.append(str(doc["source"]).encode("utf-8"))
+            scores.append(doc["ats_score"])
+            failed.append(sum(rule_bits.get(name, 0) for name in doc.get("ats_failed", ())))
+            texts.append(doc["text"].encode("utf-8"))
+
+        if not id_rows:
+            return 0
+
+        lengths = np.array([len(row) for row in id_rows], dtype=np.int64)
+        text_lengths = np.array([len(t) for t in texts], dtype=np.int64)
+        source_lengths = np.array([len(s) for s in sources], dtype=np.int64)
+        vocab_bytes = "".join(term + "\n" for term in new_terms).encode("utf-8")
+        try:
+            self._write_column("keyword_ids", np.concatenate(id_rows))
+            self._write_column("keyword_offsets", self.meta["keywords"] + np.cumsum(lengths))
+            self._write_column("text_offsets", self.meta["text_bytes"] + np.cumsum(text_lengths))
+            self._write_column("source_offsets", self.meta["sources_bytes"] + np.cumsum(source_lengths))
+            self._write_column("ats_score", np.array(scores, dtype=np.uint8))
+            self._write_column("ats_failed", np.array(failed, dtype=np.uint32))
+            with open(self._file("text.bin"), "ab") as f:
+                f.write(b"".join(texts))
+            with open(self._file("vocab.txt"), "ab") as f:
+                f.write(vocab_bytes)
+            with open(self._file("sources.bin"), "ab") as f:
+                f.write(b"".join(sources))
+        except Exception:
+            # Forget the uncommitted terms; the next append trims the partial writes
+            self._vocab = self._vocab_ids = None
+            self._checked_tail = False
+            raise
+
+        self.meta["documents"] += len(id_rows)
+        self.meta["keywords"] += int(lengths.sum())
+        self.meta["text_bytes"] += int(text_lengths.sum())
+        self.meta["vocabulary"] = len(vocab)
+        self.meta["vocab_bytes"] += len(vocab_bytes)
+        self.meta["sources_bytes"] += int(source_lengths.sum())
+        self._commit()
+
+        self._maps.clear()
+        self._blobs.clear()
+        return len(id_rows)
+
+    # Reading
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Memory-mapped view of a column, limited to committed documents.
+        """
+        if name not in self._maps:
+            length = self._column_length(name)
+            if length == 0:
+                self._maps[name] = np.zeros(0, dtype=_COLUMNS[name])
+            else:
+                self._maps[name] = np.memmap(self._file(name + ".bin"), dtype=_COLUMNS[name], mode="r", shape=(length,))
+        return self._maps[name]
+
+    def keyword_matrix(self) -> sparse.csr_matrix:
+        """
+        Binary document x vocabulary CSR matrix over the mapped id column.
+        """
+        offsets = self.column("keyword_offsets")
+        ids = self.column("keyword_ids")
+        if self.meta["keywords"] < 2 ** 31:
+            # Only the small offsets array is copied; ids stay mapped
+            offsets = offsets.astype(np.int32)
+        else:
+            ids = ids.astype(np.int64)
+        data = np.ones(len(ids), dtype=np.int8)
+        return sparse.csr_matrix((data, ids, offsets), shape=(len(self), self.meta["vocabulary"]))
+
+    def keywords(self, index: int) -> List[str]:
+        offsets = self.column("keyword_offsets")
+        ids = self.column("keyword_ids")[offsets[index]:offsets[index + 1]]
+        vocab = self.vocabulary
+        return [vocab[i] for i in ids]
+
+    def _blob_slice(self, name: str, offsets_column: str, size: int, index: int) -> str:
+        # Variable-length strings: a mapped byte file cut by an offsets column
+        if size == 0:
+            return ""
+        if name not in self._blobs:
+            self._blobs[name] = np.memmap(self._file(name), dtype=np.uint8, mode="r", shape=(size,))
+        offsets = self.column(offsets_column)
+        return bytes(self._blobs[name][offsets[index]:offsets[index + 1]]).decode("utf-8")
+
+    def text(self, index: int) -> str:
+        return self._blob_slice("text.bin", "text_offsets", self.meta["text_bytes"], index)
+
+    def source(self, index: int) -> str:
+        """
+        Source path exactly as appended; only this document's bytes are decoded.
+        """
+        return self._blob_slice("sources.bin", "source_offsets", self.meta["sources_bytes"], index)
+
+    def ats(self, index: int) -> Tuple[int, List[str]]:
+        """
+        ATS score and names of the failed rules for one document.
+        """
+        mask = int(self.column("ats_failed")[index])
+        failed = [name for i, name in enumerate(self.meta["ats_rules"]) if mask & (1 << i)]
+        return int(self.column("ats_score")[index]), failed
+
+    def score_against(self, jd_keywords: Sequence[str]) -> np.ndarray:
+        """
+        compute_match_score's match score of every stored document against
+        one JD, from a single sparse matrix-vector product.
+        """
+        from utils.batch_scorer import rounded_percent
+
+        jd_set = set([kw.lower() for kw in jd_keywords])
+        vector = np.zeros(self.meta["vocabulary"], dtype=np.int32)
+        known = [self.vocabulary_ids[kw] for kw in jd_set if kw in self.vocabulary_ids]
+        vector[known] = 1
+        overlap = self.keyword_matrix() @ vector
+        return rounded_percent(np.asarray(overlap, dtype=np.int64), max(len(jd_set), 1))
+
+    def top_k(self, jd_keywords: Sequence[str], k: int = 10) -> List[Tuple[str, float]]:
+        scores = self.score_against(jd_keywords)
+        if len(scores) == 0:
+            return []
+        k = min(k, len(scores))
+        # Ties at the k-th score go to the earliest documents, as a full sort would
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        top = np.concatenate([above, np.flatnonzero(scores == kth)[:k - len(above)]])
+        top = top[np.lexsort((top, -scores[top].astype(np.float64)))]
+        return [(self.source(int(i)), float(scores[i])) for i in top]
+
+
+def ingest(store: CorpusStore, paths: Sequence[str], batch_size: int = 256) -> int:
+    """
+    Extracts, ATS-checks and keyword-extracts resume files and appends them
+    to the store in batches. Unreadable PDFs are skipped with a message.
+    """
+    from utils.ats_checker import run_ats_checks_batch
+    from utils.keyword_extractor import extract_keywords_bulk
+    from utils.resume_parser import extract_many
+
+    added = 0
+    batch = []
+
+    def flush():
+        nonlocal added
+        texts = [doc["text"] for doc in batch]
+        for doc, result, keywords in zip(batch, run_ats_checks_batch(texts), extract_keywords_bulk(texts)):
+            doc.update(ats_score=result.score, ats_failed=result.failed, keywords=keywords)
+        added += store.append(batch)
+        batch.clear()
+
+    for result in extract_many(paths):
+        if result["error"]:
+            print(f"Skipping {result['source']}: {result['error']['message']}", file=sys.stderr)
+            continue
+        batch.append({"source": result["source"], "text": result["text"]})
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query a compact on-disk resume corpus.")
+    parser.add_argument("store", help="Corpus store directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add = subparsers.add_parser("add", help="Append resume PDFs (files or directories)")
+    add.add_argument("paths", nargs="+")
+    add.add_argument("--batch-size", type=int, default=256)
+
+    score = subparsers.add_parser("score", help="Rank stored resumes against a JD .txt")
+    score.add_argument("jd")
+    score.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    store = CorpusStore(args.store)
+    if args.command == "add":
+        from utils.batch_scorer import collect_files
+
+        added = ingest(store, collect_files(args.paths, (".pdf",)), args.batch_size)
+        print(json.dumps({"added": added, "documents": len(store), "vocabulary": store.meta["vocabulary"]}))
+        return
+
+    from utils.batch_scorer import load_jd
+    from utils.keyword_extractor import extract_keywords
+
+    jd_keywords = extract_keywords(load_jd(args.jd))
+    for source, match_score in store.top_k(jd_keywords, args.k):
+        print(f"{match_score:6.2f}  {source}")
+
+
+if __name__ == "__main__":
+    main()
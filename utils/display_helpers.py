@@ -1,12 +1,14 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
 
 def display_score(score: float, category_breakdown: dict):
     """
     Display match score and category-level breakdown + feedback with enhanced visuals.
     Professional Times New Roman styled version.
     """
+    # pandas/altair are slow to import; only pay for them when a chart is drawn
+    import pandas as pd
+    import altair as alt
+
     # Score display with gauge chart
     cols = st.columns([1, 1])
 
@@ -103,6 +105,20 @@ def display_missing_keywords(missing_keywords: list):
         </div>
         """, unsafe_allow_html=True)
 
+def display_streamed_text(deltas, template: str = "{text}") -> str:
+    """
+    Renders text into a single placeholder as deltas arrive and returns the full text.
+    `template` wraps the accumulated text, e.g. the suggestion box HTML.
+    """
+    placeholder = st.empty()
+    parts = []
+    for delta in deltas:
+        parts.append(delta)
+        placeholder.markdown(template.format(text="".join(parts) + " ▌"), unsafe_allow_html=True)
+    text = "".join(parts).strip()
+    placeholder.markdown(template.format(text=text), unsafe_allow_html=True)
+    return text
+
 def get_score_color(score: float) -> str:
     if score >= 80:
         return "#81c784"
@@ -1,26 +1,23 @@
-import os
-from openai import OpenAI
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
-def _init_client() -> OpenAI:
-    api_key = os.getenv("OPENAI_API_KEY")
-    return OpenAI(api_key=api_key)
+from utils.llm_cache import LLM_CACHE_ENABLED
+from utils.llm_client import complete_text, complete_text_async, stream_chat_completion
+from utils.prompt_builder import build_suggestion_prompt
 
-def get_gpt_suggestions(resume_text: str, jd_text: Optional[str], missing_keywords: List[str]) -> str:
-    """
-    Uses GPT to suggest improvements based on missing keywords and job description context.
-    If no JD is provided, generates general resume enhancement suggestions.
-    """
-    client = _init_client()
+CHAT_SYSTEM_PROMPT = "You are an assistant helping users improve their resumes. Answer clearly and constructively."
 
+def _suggestion_messages(resume_text: str, jd_text: Optional[str], missing_keywords: List[str]) -> List[dict]:
+    # Only the most JD-relevant sections and keywords that fit SUGGESTION_PROMPT_TOKENS are sent;
+    # the ranking is deterministic so the same inputs build the same prompt (and cache key)
+    packed = build_suggestion_prompt(resume_text, jd_text, missing_keywords)
     if jd_text:
         prompt = (
             "You are a resume optimization assistant. "
             "Given the candidate's resume, the job description, and a list of missing keywords, "
             "provide 3–5 suggestions to improve the resume. Be specific and professional.\n\n"
-            f"Missing Keywords:\n{', '.join(missing_keywords)}\n\n"
-            f"Job Description:\n{jd_text}\n\n"
-            f"Resume:\n{resume_text}\n\n"
+            f"Missing Keywords:\n{', '.join(packed.keywords)}\n\n"
+            f"Job Description:\n{packed.jd}\n\n"
+            f"Resume:\n{packed.resume}\n\n"
             "Suggestions:"
         )
     else:
@@ -28,45 +25,119 @@ def get_gpt_suggestions(resume_text: str, jd_text: Optional[str], missing_keywor
             "You are a resume optimization assistant. "
             "Given the candidate's resume, provide 3–5 suggestions to improve it for general job applications. "
             "Focus on clarity, formatting, impact, and alignment with typical job requirements.\n\n"
-            f"Resume:\n{resume_text}\n\n"
+            f"Resume:\n{packed.resume}\n\n"
             "Suggestions:"
         )
 
+    return [
+        {"role": "system", "content": "You are a helpful resume critique assistant."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _ensure_system_prompt(chat_history: List[dict]) -> None:
+    if not chat_history or chat_history[0].get("role") != "system":
+        chat_history.insert(0, {"role": "system", "content": CHAT_SYSTEM_PROMPT})
+
+def get_gpt_suggestions(
+    resume_text: str,
+    jd_text: Optional[str],
+    missing_keywords: List[str],
+    use_cache: bool = LLM_CACHE_ENABLED
+) -> str:
+    """
+    Uses GPT to suggest improvements based on missing keywords and job description context.
+    If no JD is provided, generates general resume enhancement suggestions.
+    """
+    try:
+        return complete_text(
+            _suggestion_messages(resume_text, jd_text, missing_keywords),
+            temperature=0.4,
+            max_tokens=400,
+            call_site="suggestions",
+            use_cache=use_cache
+        )
+
+    except Exception as e:
+        return f"❌ GPT suggestion error: {e}"
+
+async def get_gpt_suggestions_async(
+    resume_text: str,
+    jd_text: Optional[str],
+    missing_keywords: List[str],
+    use_cache: bool = LLM_CACHE_ENABLED
+) -> str:
+    """
+    Async variant of get_gpt_suggestions using the shared AsyncOpenAI client.
+    """
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful resume critique assistant."},
-                {"role": "user", "content": prompt}
-            ],
+        return await complete_text_async(
+            _suggestion_messages(resume_text, jd_text, missing_keywords),
             temperature=0.4,
-            max_tokens=400
+            max_tokens=400,
+            call_site="suggestions",
+            use_cache=use_cache
         )
-        return response.choices[0].message.content.strip()
 
     except Exception as e:
         return f"❌ GPT suggestion error: {e}"
 
-def get_chat_response(chat_history: List[dict]) -> str:
+def stream_gpt_suggestions(
+    resume_text: str,
+    jd_text: Optional[str],
+    missing_keywords: List[str],
+    use_cache: bool = LLM_CACHE_ENABLED
+) -> Iterator[str]:
+    """
+    Streaming variant of get_gpt_suggestions: yields text deltas as they arrive.
+    """
+    try:
+        yield from stream_chat_completion(
+            _suggestion_messages(resume_text, jd_text, missing_keywords),
+            temperature=0.4,
+            max_tokens=400,
+            call_site="suggestions",
+            use_cache=use_cache
+        )
+
+    except Exception as e:
+        yield f"❌ GPT suggestion error: {e}"
+
+def get_chat_response(chat_history: List[dict], use_cache: bool = LLM_CACHE_ENABLED) -> str:
     """
     Handles follow-up questions as a conversational chatbot using existing chat history.
     """
-    client = _init_client()
+    _ensure_system_prompt(chat_history)
 
-    if not chat_history or chat_history[0].get("role") != "system":
-        chat_history.insert(0, {
-            "role": "system",
-            "content": "You are an assistant helping users improve their resumes. Answer clearly and constructively."
-        })
+    try:
+        return complete_text(chat_history, temperature=0.5, max_tokens=500, call_site="chat", use_cache=use_cache)
+
+    except Exception as e:
+        return f"❌ GPT chat error: {e}"
+
+async def get_chat_response_async(chat_history: List[dict], use_cache: bool = LLM_CACHE_ENABLED) -> str:
+    """
+    Async variant of get_chat_response using the shared AsyncOpenAI client.
+    """
+    _ensure_system_prompt(chat_history)
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=chat_history,
-            temperature=0.5,
-            max_tokens=500
+        return await complete_text_async(
+            chat_history, temperature=0.5, max_tokens=500, call_site="chat", use_cache=use_cache
         )
-        return response.choices[0].message.content.strip()
 
     except Exception as e:
         return f"❌ GPT chat error: {e}"
+
+def stream_chat_response(chat_history: List[dict], use_cache: bool = LLM_CACHE_ENABLED) -> Iterator[str]:
+    """
+    Streaming variant of get_chat_response: yields text deltas as they arrive.
+    """
+    _ensure_system_prompt(chat_history)
+
+    try:
+        yield from stream_chat_completion(
+            chat_history, temperature=0.5, max_tokens=500, call_site="chat", use_cache=use_cache
+        )
+
+    except Exception as e:
+        yield f"❌ GPT chat error: {e}"
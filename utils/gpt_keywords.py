@@ -0,0 +1,240 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from utils.llm_cache import LLM_CACHE_ENABLED
+from utils.llm_client import LLM_MAX_CONCURRENCY
+from utils.tokens import count_tokens, truncate_to_tokens
+
+GPT_BATCH_MAX_ITEMS = int(os.getenv("GPT_BATCH_MAX_ITEMS", "16"))
+GPT_BATCH_INPUT_TOKENS = int(os.getenv("GPT_BATCH_INPUT_TOKENS", "6000"))
+GPT_BATCH_WINDOW = float(os.getenv("GPT_BATCH_WINDOW", "0.05"))
+GPT_ITEM_MAX_TOKENS = 1000
+# Single-text extraction allows 100 tokens; the JSON wrapper adds ~15 per item
+GPT_OUTPUT_TOKENS_PER_ITEM = 150
+GPT_MAX_OUTPUT_TOKENS = 4000
+
+# Stated in the prompt and enforced by _validate
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "keywords": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["id", "keywords"],
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["items"],
+    "additionalProperties": False,
+}
+
+
+def _batch_messages(texts: Sequence[str]) -> List[dict]:
+    documents = "\n\n".join(f'<document id="{i}">\n{text}\n</document>' for i, text in enumerate(texts))
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You extract the most relevant skills, tools and keywords from documents. "
+                "Reply with a single JSON object matching this JSON schema and nothing else:\n"
+                f"{json.dumps(RESPONSE_SCHEMA)}\n"
+                "Include one item per document id. Keywords are short lowercase strings."
+            ),
+        },
+        {"role": "user", "content": documents},
+    ]
+
+
+def _validate(raw_output: str, count: int) -> List[Optional[List[str]]]:
+    """
+    Parses a batch reply against RESPONSE_SCHEMA. Returns one keyword list
+    per document, or None for documents whose entry is missing, malformed
+    or given more than once.
+    """
+    results: List[Optional[List[str]]] = [None] * count
+    seen = set()
+    try:
+        data = json.loads(raw_output)
+    except ValueError:
+        return results
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return results
+    for item in items:
+        if not isinstance(item, dict) or set(item) != {"id", "keywords"}:
+            continue
+        doc_id, keywords = item["id"], item["keywords"]
+        if not isinstance(doc_id, int) or isinstance(doc_id, bool) or not 0 <= doc_id < count:
+            continue
+        if doc_id in seen:
+            # Two answers for one document; trust neither
+            results[doc_id] = None
+            continue
+        seen.add(doc_id)
+        if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+            continue
+        results[doc_id] = keywords
+    return results
+
+
+def _pack(texts: Sequence[str]) -> List[List[int]]:
+    # Greedy batches by item count and input token budget, in input order
+    batches, current, used = [], [], 0
+    for i, text in enumerate(texts):
+        cost = count_tokens(text)
+        if current and (len(current) >= GPT_BATCH_MAX_ITEMS or used + cost > GPT_BATCH_INPUT_TOKENS):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _single(text: str, use_cache: bool) -> List[str]:
+    from openai import OpenAIError
+
+    from utils.keyword_extractor import extract_with_gpt
+
+    try:
+        return extract_with_gpt(text, use_cache=use_cache)
+    except OpenAIError as e:
+        print(f"OpenAI API error: {e}")
+        return []
+
+
+def _extract_batch(texts: List[str], use_cache: bool) -> List[List[str]]:
+    """
+    One JSON-mode request for `texts`. A truncated or unparseable reply is
+    retried as two half-size batches; entries missing from an otherwise
+    valid reply are retried together as one smaller batch.
+    """
+    from openai import OpenAIError
+
+    from utils.llm_client import CompletionTruncated, complete_text
+
+    if len(texts) == 1:
+        return [_single(texts[0], use_cache)]
+    try:
+        raw_output = complete_text(
+            _batch_messages(texts),
+            temperature=0,
+            max_tokens=min(GPT_OUTPUT_TOKENS_PER_ITEM * len(texts) + 50, GPT_MAX_OUTPUT_TOKENS),
+            call_site="keywords_batch",
+            use_cache=use_cache,
+            response_format={"type": "json_object"},
+            allow_truncated=False,
+        )
+        parsed = _validate(raw_output, len(texts))
+    except CompletionTruncated:
+        parsed = [None] * len(texts)
+    except OpenAIError as e:
+        # Retrying item by item would only repeat the failure N times
+        print(f"OpenAI API error: {e}")
+        return [[] for _ in texts]
+
+    missing = [i for i, keywords in enumerate(parsed) if keywords is None]
+    if len(missing) == len(texts):
+        half = len(texts) // 2
+        return _extract_batch(texts[:half], use_cache) + _extract_batch(texts[half:], use_cache)
+    if missing:
+        for i, keywords in zip(missing, _extract_batch([texts[i] for i in missing], use_cache)):
+            parsed[i] = keywords
+    return parsed
+
+
+def extract_keywords_gpt_batch(texts: Sequence[str], use_cache: bool = LLM_CACHE_ENABLED) -> List[List[str]]:
+    """
+    Extracts keywords for many texts with as few completion requests as
+    possible: texts are packed into JSON-mode requests and each reply is
+    validated per document. Failed batches are split in half and retried,
+    so one bad reply costs a few extra requests rather than one per text.
+    """
+    from utils.keyword_extractor import _normalize
+
+    texts = [truncate_to_tokens(t, GPT_ITEM_MAX_TOKENS) for t in texts]
+    results: List[List[str]] = [[] for _ in texts]
+    for batch in _pack(texts):
+        for i, keywords in zip(batch, _extract_batch([texts[i] for i in batch], use_cache)):
+            results[i] = _normalize(keywords)
+    return results
+
+
+class KeywordBatcher:
+    """
+    Coalesces concurrent single-text requests: the first request opens a
+    short window, everything submitted within it (up to max_items) goes out
+    as one batch, and each caller's future gets its own result. Batches run
+    on a pool of `workers` threads, so a slow request doesn't hold up the
+    next window.
+    """
+
+    def __init__(self, window: float = GPT_BATCH_WINDOW, max_items: int = GPT_BATCH_MAX_ITEMS,
+                 use_cache: bool = LLM_CACHE_ENABLED, workers: int = LLM_MAX_CONCURRENCY):
+        self.window = window
+        self.max_items = max_items
+        self.use_cache = use_cache
+        self._pending: List[tuple] = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gpt-keyword-batch")
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        with self._condition:
+            self._pending.append((text, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="gpt-keyword-batcher", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def extract(self, text: str) -> List[str]:
+        return self.submit(text).result()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_items:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch, self._pending = self._pending[:self.max_items], self._pending[self.max_items:]
+            self._executor.submit(self._process, batch)
+
+    def _process(self, batch: List[tuple]) -> None:
+        try:
+            results = extract_keywords_gpt_batch([text for text, _ in batch], use_cache=self.use_cache)
+            for (_, future), keywords in zip(batch, results):
+                future.set_result(keywords)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_keyword_batcher() -> KeywordBatcher:
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = KeywordBatcher()
+    return _batcher
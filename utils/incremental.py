@@ -0,0 +1,191 @@
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+from utils import telemetry
+from utils.keyword_extractor import USE_GPT_FALLBACK
+from utils.match_scorer import CATEGORY_KEYWORDS, category_score
+
+# Long blocks are cut after lines whose hash hits this modulus, so an edit
+# only changes the chunk it lands in instead of shifting every later chunk
+CHUNK_BOUNDARY_MODULUS = 6
+MAX_PARAGRAPH_LINES = 24
+
+# Key for whole-text fallback keywords; can't collide with a paragraph
+_WHOLE_TEXT = "\0whole\0"
+
+_BLANK_LINE = re.compile(r"\n\s*\n")
+
+
+def _line_hash(line: str) -> int:
+    return int.from_bytes(hashlib.blake2b(line.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """
+    Splits text on blank lines, then cuts long blocks at content-defined
+    line boundaries. PDF text often has no blank lines at all.
+    """
+    paragraphs = []
+    for block in _BLANK_LINE.split(text):
+        lines = [line for line in block.splitlines() if line.strip()]
+        current = []
+        for line in lines:
+            current.append(line)
+            if _line_hash(line.strip()) % CHUNK_BOUNDARY_MODULUS == 0 or len(current) >= MAX_PARAGRAPH_LINES:
+                paragraphs.append("\n".join(current))
+                current = []
+        if current:
+            paragraphs.append("\n".join(current))
+    return paragraphs
+
+
+class _Document:
+    """
+    Keyword document frequencies (how many paragraphs mention each keyword)
+    for the current version of one text.
+    """
+
+    def __init__(self):
+        self.paragraphs: Counter = Counter()
+        self.counts: Counter = Counter()
+        self.keywords_by_paragraph: Dict[str, List[str]] = {}
+
+    def update(self, paragraphs: List[str], extract, fallback=None) -> Tuple[Set[str], Set[str], int]:
+        """
+        Applies a new paragraph list. Returns keywords that appeared, keywords
+        that disappeared and how many texts had to be extracted. If no
+        paragraph yields a keyword, `fallback` (when given) is run on the
+        whole text instead.
+        """
+        new = Counter(paragraphs)
+        fresh = [p for p in new if p not in self.keywords_by_paragraph]
+        if fresh:
+            self.keywords_by_paragraph.update(zip(fresh, extract(fresh)))
+        extracted = len(fresh)
+
+        if fallback is not None and new and not any(self.keywords_by_paragraph[p] for p in new):
+            whole = _WHOLE_TEXT + "\n\n".join(paragraphs)
+            for paragraph in fresh:
+                del self.keywords_by_paragraph[paragraph]
+            if whole not in self.keywords_by_paragraph:
+                self.keywords_by_paragraph[whole] = fallback(whole[len(_WHOLE_TEXT):])
+                extracted += 1
+            new = Counter([whole])
+
+        added, removed = new - self.paragraphs, self.paragraphs - new
+
+        appeared, vanished = set(), set()
+        for paragraph, times in removed.items():
+            for keyword in self.keywords_by_paragraph[paragraph]:
+                self.counts[keyword] -= times
+                if self.counts[keyword] <= 0:
+                    del self.counts[keyword]
+                    vanished.add(keyword)
+        for paragraph, times in added.items():
+            for keyword in self.keywords_by_paragraph[paragraph]:
+                if keyword not in self.counts:
+                    appeared.add(keyword)
+                self.counts[keyword] += times
+
+        for paragraph in removed:
+            if paragraph not in new:
+                del self.keywords_by_paragraph[paragraph]
+        self.paragraphs = new
+        # A keyword removed from one paragraph and added in another is unchanged
+        return appeared - vanished, vanished - appeared, extracted
+
+
+class IncrementalMatcher:
+    """
+    Keeps keyword counts for the last analyzed resume and JD, and on each
+    analyze() only extracts paragraphs that changed and updates the match
+    from the keywords whose presence changed. Results equal
+    compute_match_score over the union of paragraph keywords.
+
+    When a whole document yields no keywords paragraph by paragraph and
+    `use_gpt` is on, its keywords come from GPT over the whole text, as
+    extract_keywords would do.
+    """
+
+    def __init__(self, use_gpt: bool = USE_GPT_FALLBACK):
+        self.use_gpt = use_gpt
+        self.resume = _Document()
+        self.jd = _Document()
+        self.matched: Set[str] = set()
+        self.missing: Set[str] = set()
+        self.job_description = ""
+        self.last_stats: Dict[str, int] = {}
+
+    @staticmethod
+    def _extract(paragraphs: List[str]) -> List[List[str]]:
+        from utils.cache import cached_keywords_bulk
+
+        # Per-paragraph GPT fallback would cost a call for every short line
+        return cached_keywords_bulk(paragraphs, use_gpt=False)
+
+    @staticmethod
+    def _extract_whole(text: str) -> List[str]:
+        from utils.cache import cached_keywords
+
+        return cached_keywords(text, use_gpt=True)
+
+    def analyze(self, resume_text: str, jd_text: str) -> Tuple[float, List[str], Dict[str, float]]:
+        from utils.jd_parser import clean_job_description
+
+        resume_paragraphs = split_paragraphs(resume_text)
+        with telemetry.span("clean_job_description"):
+            # Cleaning is per-character, so cleaning each paragraph and joining
+            # gives the same text as cleaning the whole JD
+            jd_paragraphs = [c for c in (clean_job_description(p) for p in split_paragraphs(jd_text)) if c]
+            self.job_description = " ".join(jd_paragraphs)
+
+        fallback = self._extract_whole if self.use_gpt else None
+        with telemetry.span("extract_keywords"):
+            resume_up, resume_down, resume_extracted = self.resume.update(resume_paragraphs, self._extract, fallback)
+            jd_up, jd_down, jd_extracted = self.jd.update(jd_paragraphs, self._extract, fallback)
+
+        with telemetry.span("compute_match_score"):
+            for keyword in resume_up | resume_down | jd_up | jd_down:
+                in_resume, in_jd = keyword in self.resume.counts, keyword in self.jd.counts
+                self.matched.discard(keyword)
+                self.missing.discard(keyword)
+                if in_jd and in_resume:
+                    self.matched.add(keyword)
+                elif in_jd:
+                    self.missing.add(keyword)
+
+        self.last_stats = {
+            "paragraphs": len(resume_paragraphs) + len(jd_paragraphs),
+            "extracted": resume_extracted + jd_extracted,
+            "keywords_changed": len(resume_up | resume_down | jd_up | jd_down),
+        }
+        return self.result()
+
+    def result(self) -> Tuple[float, List[str], Dict[str, float]]:
+        match_score = round(len(self.matched) / max(len(self.jd.counts), 1) * 100, 2)
+        category_breakdown = {
+            category: category_score(self.matched, keywords)
+            for category, keywords in CATEGORY_KEYWORDS.items()
+        }
+        return match_score, sorted(self.missing), category_breakdown
+
+    @property
+    def resume_keywords(self) -> List[str]:
+        return list(self.resume.counts)
+
+    @property
+    def jd_keywords(self) -> List[str]:
+        return list(self.jd.counts)
+
+    def signature(self, *extra) -> str:
+        """
+        Hash of everything the scoring depends on (keyword sets plus any
+        extra inputs), used to skip the LLM when nothing relevant changed.
+        """
+        digest = hashlib.sha256()
+        for part in (sorted(self.resume.counts), sorted(self.jd.counts)) + extra:
+            digest.update(repr(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
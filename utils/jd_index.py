@@ -0,0 +1,218 @@
+import argparse
+import heapq
+import json
+import math
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.match_scorer import compute_match_score
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = os.path.join(".cache", "jd_index.json")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def jd_keyword_counts(jd_text: str) -> Counter:
+    """
+    Cleans a raw JD and counts its keywords. The key set equals what
+    extract_keywords returns; counts feed BM25 term frequencies.
+    """
+    from utils.jd_parser import clean_job_description
+    from utils.keyword_extractor import extract_keywords, extract_with_spacy
+
+    cleaned = clean_job_description(jd_text)
+    counts = Counter(kw.lower().strip() for kw in extract_with_spacy(cleaned))
+    if not counts:
+        counts = Counter(extract_keywords(cleaned))
+    return counts
+
+
+class JDIndex:
+    """
+    Inverted index from keyword to the JDs containing it.
+
+    Only the forward index (doc -> keyword counts) and file metadata are
+    persisted; postings are rebuilt on load.
+    """
+
+    def __init__(self):
+        self.docs: Dict[str, dict] = {}
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.docs
+
+    def add_document(self, doc_id: str, keyword_counts: Dict[str, int], meta: Optional[dict] = None) -> None:
+        if doc_id in self.docs:
+            self.remove_document(doc_id)
+        keyword_counts = {kw: int(tf) for kw, tf in keyword_counts.items() if kw}
+        length = sum(keyword_counts.values())
+        self.docs[doc_id] = dict(meta or {}, terms=keyword_counts, length=length)
+        for kw, tf in keyword_counts.items():
+            self.postings[kw][doc_id] = tf
+        self.total_length += length
+
+    def remove_document(self, doc_id: str) -> None:
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for kw in doc["terms"]:
+            posting = self.postings.get(kw)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[kw]
+        self.total_length -= doc["length"]
+
+    def keywords(self, doc_id: str) -> List[str]:
+        return list(self.docs[doc_id]["terms"])
+
+    def _overlaps(self, query: Iterable[str]) -> Counter:
+        # Term-at-a-time: only JDs sharing at least one keyword are ever touched
+        overlaps = Counter()
+        for kw in query:
+            for doc_id in self.postings.get(kw, ()):
+                overlaps[doc_id] += 1
+        return overlaps
+
+    def search_coverage(self, resume_keywords: List[str], k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-k JDs by the compute_match_score coverage percentage.
+        """
+        query = set([kw.lower() for kw in resume_keywords])
+        scored = (
+            (doc_id, round(overlap / max(len(self.docs[doc_id]["terms"]), 1) * 100, 2))
+            for doc_id, overlap in self._overlaps(query).items()
+        )
+        return heapq.nsmallest(k, scored, key=lambda item: (-item[1], item[0]))
+
+    def search_bm25(self, resume_keywords: List[str], k: int = 10,
+                    k1: float = BM25_K1, b: float = BM25_B) -> List[Tuple[str, float]]:
+        """
+        Top-k JDs by Okapi BM25 with the resume keyword set as the query.
+        """
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs or 1.0
+        scores = defaultdict(float)
+        for kw in set([kw.lower() for kw in resume_keywords]):
+            posting = self.postings.get(kw)
+            if not posting:
+                continue
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                norm = k1 * (1 - b + b * self.docs[doc_id]["length"] / avg_length)
+                scores[doc_id] += idf * tf * (k1 + 1) / (tf + norm)
+        return heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def search(self, resume_keywords: List[str], k: int = 10, method: str = "coverage") -> List[Tuple[str, float]]:
+        if method == "bm25":
+            return self.search_bm25(resume_keywords, k)
+        if method == "coverage":
+            return self.search_coverage(resume_keywords, k)
+        raise ValueError(f"Unknown ranking method: {method}")
+
+    def match_details(self, resume_keywords: List[str], doc_id: str):
+        """
+        Full compute_match_score result for one indexed JD.
+        """
+        return compute_match_score(resume_keywords, self.keywords(doc_id))
+
+    def sync_directory(self, directory: str, pattern_suffix: str = ".txt") -> Dict[str, int]:
+        """
+        Brings the index in line with the JD files in `directory`: new or
+        modified files are (re)indexed, deleted ones removed.
+        """
+        seen = set()
+        added = updated = 0
+        for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+            if not entry.is_file() or not entry.name.lower().endswith(pattern_suffix):
+                continue
+            doc_id = os.path.relpath(entry.path, directory)
+            seen.add(doc_id)
+            stat = entry.stat()
+            existing = self.docs.get(doc_id)
+            if existing and existing.get("mtime") == stat.st_mtime and existing.get("size") == stat.st_size:
+                continue
+            with open(entry.path, encoding="utf-8") as f:
+                counts = jd_keyword_counts(f.read())
+            self.add_document(doc_id, counts, {"mtime": stat.st_mtime, "size": stat.st_size})
+            if existing:
+                updated += 1
+            else:
+                added += 1
+
+        removed = [doc_id for doc_id in self.docs if doc_id not in seen]
+        for doc_id in removed:
+            self.remove_document(doc_id)
+        return {"added": added, "updated": updated, "removed": len(removed), "total": len(self.docs)}
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "docs": self.docs}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> "JDIndex":
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            return index
+        for doc_id, doc in data["docs"].items():
+            meta = {key: value for key, value in doc.items() if key not in ("terms", "length")}
+            index.add_document(doc_id, doc["terms"], meta)
+        return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query an inverted index of job descriptions.")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="Index file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("sync", help="Index new/changed JDs in a directory and drop deleted ones")
+    build.add_argument("directory")
+
+    search = subparsers.add_parser("search", help="Rank indexed JDs against a resume")
+    search.add_argument("resume", help="Resume .pdf or .txt")
+    search.add_argument("-k", type=int, default=10)
+    search.add_argument("--method", choices=["coverage", "bm25"], default="coverage")
+    args = parser.parse_args(argv)
+
+    index = JDIndex.load(args.index)
+    if args.command == "sync":
+        print(json.dumps(index.sync_directory(args.directory)))
+        index.save(args.index)
+        return
+
+    from utils.keyword_extractor import extract_keywords
+
+    if args.resume.lower().endswith(".pdf"):
+        from utils.resume_parser import extract_resume_text
+        with open(args.resume, "rb") as f:
+            resume_text = extract_resume_text(f)
+    else:
+        with open(args.resume, encoding="utf-8") as f:
+            resume_text = f.read()
+
+    resume_keywords = extract_keywords(resume_text)
+    for rank, (doc_id, score) in enumerate(index.search(resume_keywords, args.k, args.method), start=1):
+        print(f"{rank:>3}. {score:8.2f}  {doc_id}")
+
+
+if __name__ == "__main__":
+    main()
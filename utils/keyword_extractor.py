@@ -1,15 +1,39 @@
-import spacy
-import os
-from typing import List
-from openai import OpenAIError
-from langchain_community.embeddings import OpenAIEmbeddings
-from openai import OpenAI
+import ast
+import json
+import threading
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
 
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+SPACY_MODEL = "en_core_web_sm"
+
+# Only token.pos_ is read, which comes from the tagger + attribute_ruler
+SPACY_DISABLED_PIPES = ["parser", "ner", "lemmatizer"]
 
 USE_GPT_FALLBACK = True  # Set this to False if you want to disable GPT fallback
 
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """
+    Loads the spaCy model on first use and shares it across the process.
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL, disable=SPACY_DISABLED_PIPES)
+    return _nlp
+
+
+def __getattr__(name):
+    # Keeps `from utils.keyword_extractor import nlp` working without loading at import time
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def extract_keywords(text: str, use_gpt=USE_GPT_FALLBACK) -> List[str]:
     """
@@ -18,46 +42,114 @@ def extract_keywords(text: str, use_gpt=USE_GPT_FALLBACK) -> List[str]:
     keywords = extract_with_spacy(text)
 
     if not keywords and use_gpt:
-        try:
-            keywords = extract_with_gpt(text)
-        except OpenAIError as e:
-            print(f"OpenAI API error: {e}")
-            keywords = []
+        keywords = _gpt_fallback(text)
 
-    return list(set([kw.lower().strip() for kw in keywords]))
+    return _normalize(keywords)
+
+
+def extract_keywords_bulk(
+    texts: Iterable[str],
+    use_gpt=USE_GPT_FALLBACK,
+    batch_size: int = 64,
+    n_process: int = 1
+) -> Iterator[List[str]]:
+    """
+    Streaming version of extract_keywords for many texts.
+    Yields one keyword list per input text, in order. GPT fallbacks are
+    collected per batch and sent together.
+    """
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    while True:
+        batch = [(doc.text, _doc_keywords(doc)) for doc in islice(docs, batch_size)]
+        if not batch:
+            return
+        empty = [text for text, keywords in batch if not keywords] if use_gpt else []
+        fallback = iter(_gpt_fallback_batch(empty) if empty else [])
+        for _, keywords in batch:
+            if not keywords and use_gpt:
+                keywords = next(fallback)
+            yield _normalize(keywords)
 
 
 def extract_with_spacy(text: str) -> List[str]:
     """
     Uses spaCy to extract nouns and verbs as rough 'keywords'.
     """
-    doc = nlp(text)
-    keywords = [token.text for token in doc if token.pos_ in ['NOUN', 'PROPN', 'VERB'] and len(token.text) > 2]
-    return keywords
+    return _doc_keywords(get_nlp()(text))
 
 
-def extract_with_gpt(text: str) -> List[str]:
+def extract_with_spacy_bulk(texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator[List[str]]:
     """
-    Uses OpenAI to extract keywords from the text (fallback method).
+    Runs extract_with_spacy over many texts with nlp.pipe.
     """
-    from openai import OpenAI
+    for doc in get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield _doc_keywords(doc)
 
-    client = OpenAI()
 
+def _doc_keywords(doc) -> List[str]:
+    return [token.text for token in doc if token.pos_ in ['NOUN', 'PROPN', 'VERB'] and len(token.text) > 2]
+
+
+def _normalize(keywords: List[str]) -> List[str]:
+    return list(set([kw.lower().strip() for kw in keywords]))
+
+
+def _gpt_fallback(text: str) -> List[str]:
+    from utils.gpt_keywords import get_keyword_batcher
+
+    # Concurrent fallbacks (threads, sessions) are coalesced into one request
+    return get_keyword_batcher().extract(text)
+
+
+def _gpt_fallback_batch(texts: List[str]) -> List[List[str]]:
+    from utils.gpt_keywords import extract_keywords_gpt_batch
+
+    return extract_keywords_gpt_batch(texts)
+
+
+def _gpt_messages(text: str) -> List[dict]:
     prompt = (
         "Extract the most relevant skills, tools, and keywords from this text. "
-        "Return them as a Python list of lowercase strings:\n\n"
+        "Return them as a JSON array of lowercase strings and nothing else:\n\n"
         f"{text}\n\nKeywords:"
     )
+    return [{"role": "user", "content": prompt}]
+
+
+def _parse_gpt_keywords(raw_output: str) -> List[str]:
+    """
+    Parses the first list literal in the reply as JSON, or as a Python
+    literal for older cached replies. Never evaluates code.
+    """
+    start, end = raw_output.find("["), raw_output.rfind("]")
+    if start == -1 or end < start:
+        return []
+    literal = raw_output[start:end + 1]
+    try:
+        keywords = json.loads(literal)
+    except ValueError:
+        try:
+            keywords = ast.literal_eval(literal)
+        except (ValueError, SyntaxError):
+            return []
+    if not isinstance(keywords, list):
+        return []
+    return [kw for kw in keywords if isinstance(kw, str)]
 
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}],
+
+def extract_with_gpt(text: str, use_cache: Optional[bool] = None) -> List[str]:
+    """
+    Uses OpenAI to extract keywords from the text (fallback method).
+    Responses are cached on disk unless use_cache is False or LLM_CACHE_DISABLED=1.
+    """
+    from utils.llm_cache import LLM_CACHE_ENABLED
+    from utils.llm_client import complete_text
+
+    raw_output = complete_text(
+        _gpt_messages(text),
         temperature=0.3,
         max_tokens=100,
+        call_site="keywords",
+        use_cache=LLM_CACHE_ENABLED if use_cache is None else use_cache,
     )
-
-    # Safely eval the result (expects a Python-style list string)
-    raw_output = response.choices[0].message.content
-    keywords = eval(raw_output.strip()) if "[" in raw_output else []
-    return keywords
+    return _parse_gpt_keywords(raw_output)
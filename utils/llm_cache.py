@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from utils import telemetry
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_DISABLED", "0") != "1"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def cache_key(model: str, messages: List[dict], temperature: float, max_tokens: int) -> str:
+    """
+    Hashes a completion request. Message content is whitespace-normalized so
+    trivially different prompts share an entry.
+    """
+    normalized = {
+        "model": model,
+        "messages": [
+            {"role": m.get("role"), "content": _WHITESPACE.sub(" ", str(m.get("content", ""))).strip()}
+            for m in messages
+        ],
+        "temperature": round(float(temperature), 4),
+        "max_tokens": max_tokens,
+    }
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed completion cache with a TTL and LRU eviction past max_entries.
+    Hit/miss counters are kept per call site.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+            self._conn = conn
+        return self._conn
+
+    def _count(self, call_site: str, field: str) -> None:
+        site = self.counters.setdefault(call_site, {"hits": 0, "misses": 0})
+        site[field] += 1
+
+    def get(self, key: str, call_site: str = "default") -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] > self.ttl:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    row = None
+                if row:
+                    conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"LLM cache read error: {e}")
+                row = None
+            self._count(call_site, "hits" if row else "misses")
+        return row[0] if row else None
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, response, now, now),
+                )
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+                (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM responses WHERE key IN ("
+                        " SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"LLM cache write error: {e}")
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            stats = {}
+            for call_site, counts in self.counters.items():
+                total = counts["hits"] + counts["misses"]
+                stats[call_site] = dict(counts, hit_rate=counts["hits"] / total if total else 0.0)
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+            self._connection().commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Returns the process-wide LLM response cache.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
+
+
+def _metrics():
+    if _cache is None:
+        return []
+    gauges = []
+    for call_site, counts in _cache.stats().items():
+        gauges.append(("llm_cache_hits", {"call_site": call_site}, counts["hits"]))
+        gauges.append(("llm_cache_misses", {"call_site": call_site}, counts["misses"]))
+    return gauges
+
+
+telemetry.register_collector(_metrics)
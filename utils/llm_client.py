@@ -0,0 +1,317 @@
+import asyncio
+import contextvars
+import os
+import queue
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+
+from utils import telemetry
+from utils.constants import DEFAULT_MODEL
+from utils.llm_cache import LLM_CACHE_ENABLED, cache_key, get_llm_cache
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_BACKOFF_BASE = 0.5
+LLM_BACKOFF_MAX = 8.0
+
+_client = None
+_client_lock = threading.Lock()
+
+# httpx async pools are tied to the event loop that created them
+_async_clients = weakref.WeakKeyDictionary()
+_semaphores = weakref.WeakKeyDictionary()
+
+# (call_site, time_to_first_token_s, total_s) for recent streamed calls
+LATENCY_LOG = deque(maxlen=1000)
+
+_STREAM_DONE = object()
+
+
+class CompletionTruncated(Exception):
+    """
+    Raised by complete_text(allow_truncated=False) when the reply stopped at max_tokens.
+    """
+
+
+def get_client():
+    """
+    Returns the process-wide synchronous OpenAI client (thread-safe, connection-pooled).
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                _client = OpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    base_url=os.getenv("OPENAI_BASE_URL"),
+                    timeout=LLM_TIMEOUT,
+                )
+    return _client
+
+
+def get_async_client():
+    """
+    Returns the AsyncOpenAI client for the running event loop, creating it once per loop.
+    Retries are handled by chat_completion, so the SDK's own retries are disabled.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        import httpx
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL"),
+            timeout=LLM_TIMEOUT,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONCURRENCY,
+                    max_keepalive_connections=LLM_MAX_CONCURRENCY,
+                ),
+                timeout=LLM_TIMEOUT,
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def _is_retryable(error: Exception) -> bool:
+    import openai
+
+    if isinstance(error, (asyncio.TimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+async def chat_completion(
+    messages: List[dict],
+    temperature: float,
+    max_tokens: int,
+    model: str = DEFAULT_MODEL,
+    timeout: Optional[float] = None,
+    max_retries: int = LLM_MAX_RETRIES
+):
+    """
+    Sends one chat completion request with bounded concurrency, a per-attempt
+    timeout and exponential backoff with jitter on transient errors.
+    """
+    client = get_async_client()
+    timeout = LLM_TIMEOUT if timeout is None else timeout
+
+    for attempt in range(max_retries + 1):
+        try:
+            async with _get_semaphore():
+                return await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    ),
+                    timeout=timeout,
+                )
+        except Exception as e:
+            if attempt == max_retries or not _is_retryable(e):
+                raise
+            delay = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+
+def complete_text(
+    messages: List[dict],
+    temperature: float,
+    max_tokens: int,
+    model: str = DEFAULT_MODEL,
+    call_site: str = "default",
+    use_cache: bool = LLM_CACHE_ENABLED,
+    response_format: Optional[dict] = None,
+    allow_truncated: bool = True
+) -> str:
+    """
+    Returns the stripped completion text, served from the response cache when possible.
+    Pass response_format={"type": "json_object"} to request JSON mode, and
+    allow_truncated=False to get CompletionTruncated instead of a cut-off reply.
+    """
+    key = cache_key(model, messages, temperature, max_tokens)
+    if use_cache:
+        cached = get_llm_cache().get(key, call_site)
+        if cached is not None:
+            return cached
+
+    with telemetry.span(f"llm.{call_site}"):
+        response = get_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **({"response_format": response_format} if response_format else {}),
+        )
+    telemetry.record_token_usage(call_site, response.usage)
+    if response.choices[0].finish_reason == "length" and not allow_truncated:
+        telemetry.increment("llm_truncated_total", call_site=call_site)
+        raise CompletionTruncated(f"{call_site} reply exceeded {max_tokens} tokens")
+    text = response.choices[0].message.content.strip()
+    if use_cache and text:
+        get_llm_cache().put(key, text)
+    return text
+
+
+async def complete_text_async(
+    messages: List[dict],
+    temperature: float,
+    max_tokens: int,
+    model: str = DEFAULT_MODEL,
+    call_site: str = "default",
+    use_cache: bool = LLM_CACHE_ENABLED
+) -> str:
+    """
+    Async variant of complete_text built on chat_completion. Cache lookups
+    and writes hit SQLite, so they run in a thread to keep the loop free.
+    """
+    key = cache_key(model, messages, temperature, max_tokens)
+    if use_cache:
+        cached = await asyncio.to_thread(get_llm_cache().get, key, call_site)
+        if cached is not None:
+            return cached
+
+    with telemetry.span(f"llm.{call_site}"):
+        response = await chat_completion(messages, temperature=temperature, max_tokens=max_tokens, model=model)
+    telemetry.record_token_usage(call_site, response.usage)
+    text = response.choices[0].message.content.strip()
+    if use_cache and text:
+        await asyncio.to_thread(get_llm_cache().put, key, text)
+    return text
+
+
+def record_latency(call_site: str, time_to_first_token: Optional[float], total: float) -> None:
+    LATENCY_LOG.append((call_site, time_to_first_token, total))
+    if time_to_first_token is not None:
+        telemetry.observe("llm_time_to_first_token_seconds", time_to_first_token, call_site=call_site)
+    telemetry.observe("llm_stream_seconds", total, call_site=call_site)
+
+
+def get_latency_stats() -> Dict[str, dict]:
+    """
+    Summarizes recent streamed calls per call site: count, mean and last
+    time-to-first-token and total generation time, in seconds.
+    """
+    stats = {}
+    for call_site, ttft, total in list(LATENCY_LOG):
+        entry = stats.setdefault(call_site, {"calls": 0, "ttft": [], "total": []})
+        entry["calls"] += 1
+        if ttft is not None:
+            entry["ttft"].append(ttft)
+        entry["total"].append(total)
+
+    for entry in stats.values():
+        ttfts, totals = entry.pop("ttft"), entry.pop("total")
+        entry["mean_ttft_s"] = sum(ttfts) / len(ttfts) if ttfts else None
+        entry["last_ttft_s"] = ttfts[-1] if ttfts else None
+        entry["mean_total_s"] = sum(totals) / len(totals)
+        entry["last_total_s"] = totals[-1]
+    return stats
+
+
+def stream_chat_completion(
+    messages: List[dict],
+    temperature: float,
+    max_tokens: int,
+    model: str = DEFAULT_MODEL,
+    call_site: str = "chat",
+    use_cache: bool = LLM_CACHE_ENABLED
+) -> Iterator[str]:
+    """
+    Yields content deltas as they arrive and records time-to-first-token and
+    total generation time under `call_site`. A cached response is yielded
+    whole; a fully received stream is added to the cache.
+    """
+    start = time.perf_counter()
+    first_token = None
+    key = cache_key(model, messages, temperature, max_tokens)
+    try:
+        if use_cache:
+            cached = get_llm_cache().get(key, call_site)
+            if cached is not None:
+                first_token = time.perf_counter() - start
+                yield cached
+                return
+
+        parts = []
+        stream = get_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token is None:
+                # Match the .strip() the non-streaming calls apply
+                delta = delta.lstrip()
+                if not delta:
+                    continue
+                first_token = time.perf_counter() - start
+            parts.append(delta)
+            yield delta
+
+        if use_cache and parts:
+            get_llm_cache().put(key, "".join(parts).strip())
+    finally:
+        record_latency(call_site, first_token, time.perf_counter() - start)
+
+
+def prefetch_stream(stream: Iterator[str]) -> Iterator[str]:
+    """
+    Starts consuming `stream` on a background thread right away and returns an
+    iterator over the buffered deltas, so the request is in flight while the
+    caller does other work. An exception raised by `stream` is re-raised
+    to the caller after the deltas that arrived before it.
+    """
+    buffer = queue.Queue()
+    failure = []
+
+    def consume():
+        try:
+            for delta in stream:
+                buffer.put(delta)
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            buffer.put(_STREAM_DONE)
+
+    # Run in a copy of the caller's context so spans land in its request trace
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(consume,), name="llm-stream", daemon=True).start()
+
+    def drain():
+        while True:
+            delta = buffer.get()
+            if delta is _STREAM_DONE:
+                if failure:
+                    raise failure[0]
+                return
+            yield delta
+
+    return drain()
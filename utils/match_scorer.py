@@ -6,6 +6,12 @@ TECH_KEYWORDS = ["python", "java", "c++", "django", "flask", "node", "sql", "res
 TOOL_KEYWORDS = ["git", "docker", "ci", "cd", "notion", "jira", "firebase", "mongodb"]
 SOFT_KEYWORDS = ["communication", "team", "collaboration", "problem-solving", "leadership", "ownership"]
 
+CATEGORY_KEYWORDS = {
+    "Technical": TECH_KEYWORDS,
+    "Tools": TOOL_KEYWORDS,
+    "Soft Skills": SOFT_KEYWORDS,
+}
+
 def compute_match_score(
     resume_keywords: List[str],
     jd_keywords: List[str]
@@ -21,15 +27,48 @@ def compute_match_score(
 
     # Category-wise scoring
     category_breakdown = {
-        "Technical": _category_score(matched_keywords, TECH_KEYWORDS),
-        "Tools": _category_score(matched_keywords, TOOL_KEYWORDS),
-        "Soft Skills": _category_score(matched_keywords, SOFT_KEYWORDS),
+        category: category_score(matched_keywords, keywords)
+        for category, keywords in CATEGORY_KEYWORDS.items()
     }
 
     return match_score, missing_keywords, category_breakdown
 
 
-def _category_score(matched: set, category_keywords: List[str]) -> float:
+def category_score(matched: set, category_keywords: List[str]) -> float:
+    """
+    Percentage of a category's keywords that are in `matched`.
+    """
     count = sum(1 for kw in matched if kw in category_keywords)
     total = len(category_keywords)
     return round((count / total) * 100, 2) if total else 0.0
+
+
+def compute_skill_match(
+    resume_text: str,
+    jd_text: str,
+    taxonomy=None
+) -> Tuple[float, List[str], Dict[str, float]]:
+    """
+    Matches raw resume and JD text against the skill taxonomy, so multi-word
+    and punctuated skills ("machine learning", "c++", "ci/cd") are found.
+    Category coverage is the share of the JD's skills in each category that
+    the resume also mentions; only categories the JD asks for are included.
+    """
+    from utils.skill_taxonomy import get_taxonomy
+
+    taxonomy = taxonomy or get_taxonomy()
+    resume_skills = taxonomy.find_skills(resume_text)
+    jd_skills = taxonomy.find_skills(jd_text)
+
+    matched_skills = resume_skills & jd_skills
+    missing_skills = sorted(jd_skills - resume_skills)
+    skill_score = round(len(matched_skills) / max(len(jd_skills), 1) * 100, 2)
+
+    category_breakdown = {}
+    for category in taxonomy.categories:
+        required = [s for s in jd_skills if taxonomy.category_of(s) == category]
+        if required:
+            covered = sum(1 for s in required if s in matched_skills)
+            category_breakdown[category] = round(covered / len(required) * 100, 2)
+
+    return skill_score, missing_skills, category_breakdown
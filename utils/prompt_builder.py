@@ -0,0 +1,183 @@
+import math
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils import telemetry
+from utils.tokens import count_tokens, truncate_to_tokens
+
+SUGGESTION_PROMPT_TOKENS = int(os.getenv("SUGGESTION_PROMPT_TOKENS", "1500"))
+MAX_MISSING_KEYWORDS = 40
+JD_SHARE = 0.35
+JD_CHUNK_WORDS = 30
+
+SECTION_ALIASES = {
+    "summary": ("summary", "profile", "objective", "about me", "professional summary"),
+    "experience": ("experience", "work experience", "professional experience", "employment", "work history"),
+    "projects": ("projects", "personal projects", "selected projects"),
+    "education": ("education", "academic background"),
+    "skills": ("skills", "technical skills", "core competencies", "technologies"),
+    "certifications": ("certifications", "certificates", "awards", "achievements"),
+}
+_HEADER_NAMES = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+_WORDS = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+_stats_lock = threading.Lock()
+_stats = {"prompts": 0, "original_tokens": 0, "prompt_tokens": 0}
+
+
+class SuggestionPrompt:
+    def __init__(self, resume: str, jd: str, keywords: List[str], original_tokens: int, prompt_tokens: int):
+        self.resume = resume
+        self.jd = jd
+        self.keywords = keywords
+        self.original_tokens = original_tokens
+        self.prompt_tokens = prompt_tokens
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.original_tokens - self.prompt_tokens, 0)
+
+
+def split_sections(resume_text: str) -> List[Tuple[str, str]]:
+    """
+    Splits a resume into (section, text) pairs on recognised header lines.
+    Text before the first header is returned as "header" (name, contact).
+    """
+    sections = [("header", [])]
+    for line in resume_text.splitlines():
+        key = line.strip().lower().rstrip(":").strip()
+        if key in _HEADER_NAMES and len(key) < 40:
+            sections.append((_HEADER_NAMES[key], [line.strip()]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, "\n".join(lines).strip()) for name, lines in sections if "\n".join(lines).strip()]
+
+
+def _terms(text: str) -> Set[str]:
+    return set(_WORDS.findall(text.lower()))
+
+
+def rank_missing_keywords(missing_keywords: List[str], jd_text: str, jd_skills: Set[str]) -> List[str]:
+    """
+    Orders missing keywords by usefulness: taxonomy skills first, then how
+    often the JD mentions them; ties alphabetical so prompts stay stable.
+    """
+    counts: Dict[str, int] = {}
+    for word in _WORDS.findall(jd_text.lower()):
+        counts[word] = counts.get(word, 0) + 1
+    return sorted(missing_keywords, key=lambda k: (k not in jd_skills, -counts.get(k, 0), k))
+
+
+def _rank_sections(sections: List[Tuple[str, str]], relevant: Set[str]) -> List[int]:
+    scores = []
+    for index, (name, text) in enumerate(sections):
+        hits = len(_terms(text) & relevant)
+        # Length-normalized so a long section doesn't win on size alone
+        score = hits / math.sqrt(count_tokens(text) + 1)
+        if name == "header":
+            score = -1.0
+        scores.append((-score, index))
+    return [index for _, index in sorted(scores)]
+
+
+def _pack_resume(resume_text: str, relevant: Set[str], budget: int) -> str:
+    sections = split_sections(resume_text)
+    chosen: Dict[int, str] = {}
+    remaining = budget
+    for index in _rank_sections(sections, relevant):
+        text = sections[index][1]
+        cost = count_tokens(text)
+        if cost <= remaining:
+            chosen[index] = text
+            remaining -= cost
+        elif remaining > 50:
+            chosen[index] = truncate_to_tokens(text, remaining)
+            remaining = 0
+        if remaining <= 0:
+            break
+    # Original order reads naturally to the model
+    return "\n\n".join(chosen[i] for i in sorted(chosen))
+
+
+def _pack_jd(jd_text: str, relevant: Set[str], budget: int) -> str:
+    if count_tokens(jd_text) <= budget:
+        return jd_text
+    # The cleaned JD has no line breaks, so rank fixed word windows instead
+    words = jd_text.split()
+    chunks = [" ".join(words[i:i + JD_CHUNK_WORDS]) for i in range(0, len(words), JD_CHUNK_WORDS)]
+    ranked = sorted(range(len(chunks)), key=lambda i: (-len(_terms(chunks[i]) & relevant), i))
+    chosen = []
+    remaining = budget
+    for index in ranked:
+        cost = count_tokens(chunks[index]) + 1
+        if cost > remaining:
+            continue
+        chosen.append(index)
+        remaining -= cost
+    return " … ".join(chunks[i] for i in sorted(chosen))
+
+
+def build_suggestion_prompt(
+    resume_text: str,
+    jd_text: Optional[str],
+    missing_keywords: List[str],
+    budget: int = SUGGESTION_PROMPT_TOKENS
+) -> SuggestionPrompt:
+    """
+    Packs the most JD-relevant resume sections, JD passages and missing
+    keywords into `budget` tokens. Without a JD only the resume is packed.
+    """
+    from utils.skill_taxonomy import get_taxonomy
+
+    resume_tokens = count_tokens(resume_text)
+    original_tokens = resume_tokens + count_tokens(jd_text or "") + count_tokens(", ".join(missing_keywords))
+
+    # Prompts that already fit are sent unchanged, except that keywords are
+    # sorted: they come from a set, and set order varies with the hash seed
+    if original_tokens <= budget:
+        prompt = SuggestionPrompt(resume_text, jd_text or "", sorted(missing_keywords) if jd_text else [],
+                                  original_tokens, original_tokens)
+        _record(prompt)
+        return prompt
+
+    if not jd_text:
+        resume = _pack_resume(resume_text, set(), budget)
+        prompt = SuggestionPrompt(resume, "", [], original_tokens, count_tokens(resume))
+        _record(prompt)
+        return prompt
+
+    jd_skills = get_taxonomy().find_skills(jd_text)
+    keywords = rank_missing_keywords(missing_keywords, jd_text, jd_skills)[:MAX_MISSING_KEYWORDS]
+    relevant = jd_skills | set(keywords) | {t for skill in jd_skills for t in _terms(skill)}
+
+    keyword_tokens = count_tokens(", ".join(keywords))
+    room = budget - keyword_tokens
+    # The JD gets its share, plus whatever a short resume leaves unused; the
+    # resume then gets everything the packed JD didn't take
+    jd = _pack_jd(jd_text, relevant, max(int(room * JD_SHARE), room - resume_tokens))
+    resume_budget = room - count_tokens(jd)
+    resume = resume_text if resume_tokens <= resume_budget else _pack_resume(resume_text, relevant, resume_budget)
+
+    prompt = SuggestionPrompt(resume, jd, keywords, original_tokens, keyword_tokens + count_tokens(jd) + count_tokens(resume))
+    _record(prompt)
+    return prompt
+
+
+def _record(prompt: SuggestionPrompt) -> None:
+    with _stats_lock:
+        _stats["prompts"] += 1
+        _stats["original_tokens"] += prompt.original_tokens
+        _stats["prompt_tokens"] += prompt.prompt_tokens
+    telemetry.increment("prompt_tokens_saved_total", prompt.tokens_saved, call_site="suggestions")
+
+
+def get_compression_stats() -> Dict[str, int]:
+    """
+    Totals over all suggestion prompts built so far, including tokens saved.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["tokens_saved"] = max(stats["original_tokens"] - stats["prompt_tokens"], 0)
+    return stats
@@ -1,14 +1,175 @@
-import fitz  # PyMuPDF
+import os
+import signal
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
 
-def extract_resume_text(resume_file) -> str:
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_TIMEOUT = 30.0
+
+
+class PDFExtractionError(Exception):
+    """
+    Raised when a PDF can't be turned into text.
+    `kind` is one of: malformed, encrypted, too_large, timeout.
+    """
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+        self.message = message
+
+    def to_dict(self) -> dict:
+        return {"type": self.kind, "message": self.message}
+
+
+def _open_pdf(source, max_bytes: Optional[int]):
+    import fitz  # PyMuPDF, imported lazily to keep startup fast
+
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            if max_bytes is not None and os.path.getsize(source) > max_bytes:
+                raise PDFExtractionError("too_large", f"PDF is larger than {max_bytes} bytes")
+            doc = fitz.open(source, filetype="pdf")
+        else:
+            data = source if isinstance(source, (bytes, bytearray)) else source.read()
+            if max_bytes is not None and len(data) > max_bytes:
+                raise PDFExtractionError("too_large", f"PDF is larger than {max_bytes} bytes")
+            doc = fitz.open(stream=data, filetype="pdf")
+    except PDFExtractionError:
+        raise
+    except Exception as e:
+        raise PDFExtractionError("malformed", f"Error reading PDF: {e}") from e
+
+    if doc.needs_pass:
+        doc.close()
+        raise PDFExtractionError("encrypted", "PDF is password protected")
+    return doc
+
+
+def iter_resume_pages(source, max_pages: Optional[int] = None, max_bytes: Optional[int] = None) -> Iterator[str]:
+    """
+    Yields the text of each page in turn. `source` is a path, bytes, or a
+    file-like object. Only one page's text is held at a time.
+    """
+    doc = _open_pdf(source, max_bytes)
+    try:
+        for page_number in range(doc.page_count):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            try:
+                yield doc.load_page(page_number).get_text()
+            except Exception as e:
+                raise PDFExtractionError("malformed", f"Error reading page {page_number + 1}: {e}") from e
+    finally:
+        doc.close()
+
+
+def extract_resume_text(resume_file, max_pages: Optional[int] = None, max_bytes: Optional[int] = None) -> str:
     """
     Extracts text from a resume PDF using PyMuPDF (fitz).
+    Raises PDFExtractionError for unreadable files.
     """
+    return "".join(iter_resume_pages(resume_file, max_pages, max_bytes)).strip()
+
+
+def _on_timeout(signum, frame):
+    raise TimeoutError
+
+
+def _extract_one(args) -> dict:
+    path, max_pages, max_bytes, timeout = args
+    result = {"source": path, "text": "", "pages": 0, "truncated": False, "error": None}
+
+    # SIGALRM bounds a runaway document without killing the worker. Python only
+    # handles it between bytecodes, so one long MuPDF call (a huge page) still
+    # runs to completion before the timeout is raised
+    use_alarm = timeout and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
     try:
-        doc = fitz.open(stream=resume_file.read(), filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text.strip()
+        doc = _open_pdf(path, max_bytes)
+        try:
+            limit = doc.page_count if max_pages is None else min(max_pages, doc.page_count)
+            result["truncated"] = limit < doc.page_count
+            result["text"] = "".join(doc.load_page(i).get_text() for i in range(limit)).strip()
+            result["pages"] = limit
+        finally:
+            doc.close()
+    except PDFExtractionError as e:
+        result["error"] = e.to_dict()
+    except TimeoutError:
+        result["error"] = {"type": "timeout", "message": f"Extraction exceeded {timeout}s"}
     except Exception as e:
-        return f"Error reading PDF: {e}"
+        result["error"] = {"type": "malformed", "message": f"Error reading PDF: {e}"}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return result
+
+
+def extract_document(
+    source,
+    max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    timeout: Optional[float] = DEFAULT_TIMEOUT
+) -> dict:
+    """
+    Extracts one PDF (path or bytes) without raising, returning the same
+    result dict as extract_many: {source, text, pages, truncated, error}.
+    """
+    return _extract_one((source, max_pages, max_bytes, timeout))
+
+
+def extract_many(
+    paths: Iterable[str],
+    max_workers: Optional[int] = None,
+    max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    chunksize: int = 4
+) -> Iterator[dict]:
+    """
+    Extracts many PDFs across a process pool, yielding one result dict per
+    path in input order: {source, text, pages, truncated, error}. `error` is
+    None on success, otherwise {type, message}.
+
+    Paths are consumed lazily and at most two chunks per worker are in
+    flight, so memory doesn't grow with the collection. `timeout` is
+    enforced between pages, not inside a single page's extraction.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+
+    def chunks():
+        iterator = iter(paths)
+        while True:
+            chunk = [(path, max_pages, max_bytes, timeout) for path in islice(iterator, chunksize)]
+            if not chunk:
+                return
+            yield chunk
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for results in ordered_map(pool, _extract_chunk, chunks(), 2 * max_workers):
+            yield from results
+
+
+def _extract_chunk(tasks: list) -> list:
+    return [_extract_one(task) for task in tasks]
+
+
+def ordered_map(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Like executor.map, but pulls `items` lazily and keeps at most `window`
+    tasks in flight. Results come back in submission order.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,214 @@
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from utils.match_scorer import CATEGORY_KEYWORDS, category_score
+
+SEMANTIC_THRESHOLD = 0.8
+VECTOR_DIM = 4096
+NGRAM_SIZES = (2, 3, 4)
+VECTOR_CACHE_SIZE = 100_000
+SIMILARITY_BLOCK_ROWS = 2048
+
+_VOWELS = set("aeiouy")
+# Derivational endings, rewritten after inflections are removed
+_DERIVATIONS = (("ization", "ize"), ("ational", "ate"), ("ment", ""))
+
+
+def _strip_plural(word: str) -> str:
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _strip_inflection(word: str) -> str:
+    if word.endswith("ied"):
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed"):
+        stem = word[:-len(suffix)]
+        # "speed", "string": no stripping without a vowel-bearing stem of three letters
+        if word.endswith(suffix) and not word.endswith("eed") and len(stem) >= 3 and _VOWELS & set(stem):
+            # "running" -> "runn" -> "run"
+            if stem[-1] == stem[-2] and stem[-1] not in "lszaeiouy":
+                stem = stem[:-1]
+            return stem
+    return word
+
+
+def lemma(word: str) -> str:
+    """
+    Rule-based stem good enough to merge inflections ("developing",
+    "developed", "develops" -> "develop") without a model. Every form of a
+    word goes through the same steps, and a final "e" is always dropped,
+    so "service"/"services" and "manage"/"managing" meet at one stem while
+    "engineer" and "engine" stay apart.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    stem = _strip_inflection(_strip_plural(word))
+    for suffix, replacement in _DERIVATIONS:
+        if stem.endswith(suffix) and len(stem) - len(suffix) >= 3:
+            stem = stem[:-len(suffix)] + replacement
+            break
+    if stem.endswith("e") and len(stem) > 3:
+        stem = stem[:-1]
+    return stem
+
+
+def canonical_keyword(keyword: str, aliases: Optional[Dict[str, str]] = None) -> str:
+    """
+    Lowercases, resolves taxonomy aliases ("k8s" -> "kubernetes") and
+    lemmatizes each word of anything that isn't a known skill.
+    """
+    keyword = " ".join(keyword.lower().split())
+    if aliases is None:
+        from utils.skill_taxonomy import get_taxonomy
+        aliases = get_taxonomy().aliases
+    if keyword in aliases:
+        return aliases[keyword]
+    return " ".join(lemma(w) for w in keyword.split())
+
+
+class KeywordVectorizer:
+    """
+    Maps keywords to L2-normalized hashed character n-gram vectors, computed
+    once per keyword and kept in a bounded LRU cache. Works fully offline.
+    """
+
+    def __init__(self, dim: int = VECTOR_DIM, ngram_sizes: Sequence[int] = NGRAM_SIZES,
+                 cache_size: int = VECTOR_CACHE_SIZE, aliases: Optional[Dict[str, str]] = None):
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.cache_size = cache_size
+        self.aliases = aliases
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _compute(self, keyword: str) -> np.ndarray:
+        text = f"#{canonical_keyword(keyword, self.aliases)}#"
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for n in self.ngram_sizes:
+            for i in range(max(len(text) - n + 1, 1)):
+                # crc32 rather than hash(): stable across processes
+                vector[zlib.crc32(text[i:i + n].encode("utf-8")) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def vector(self, keyword: str) -> np.ndarray:
+        with self._lock:
+            cached = self._cache.get(keyword)
+            if cached is not None:
+                self._cache.move_to_end(keyword)
+                return cached
+        vector = self._compute(keyword)
+        with self._lock:
+            self._cache[keyword] = vector
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def matrix(self, keywords: Sequence[str]) -> np.ndarray:
+        if not keywords:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([self.vector(k) for k in keywords])
+
+
+_vectorizer = None
+_vectorizer_lock = threading.Lock()
+
+
+def get_vectorizer() -> KeywordVectorizer:
+    global _vectorizer
+    if _vectorizer is None:
+        with _vectorizer_lock:
+            if _vectorizer is None:
+                _vectorizer = KeywordVectorizer()
+    return _vectorizer
+
+
+def similarity_matrix(resume_keywords: Sequence[str], jd_keywords: Sequence[str],
+                      vectorizer: Optional[KeywordVectorizer] = None) -> np.ndarray:
+    """
+    Cosine similarity of every resume keyword against every JD keyword, as one matrix product.
+    """
+    vectorizer = vectorizer or get_vectorizer()
+    return vectorizer.matrix(resume_keywords) @ vectorizer.matrix(jd_keywords).T
+
+
+def compute_semantic_match_score(
+    resume_keywords: List[str],
+    jd_keywords: List[str],
+    threshold: float = SEMANTIC_THRESHOLD,
+    vectorizer: Optional[KeywordVectorizer] = None
+) -> Tuple[float, List[str], Dict[str, float]]:
+    """
+    Like compute_match_score, but a JD keyword counts as matched when some
+    resume keyword's similarity reaches `threshold`, so aliases, inflections
+    and near-spellings match ("postgres"/"postgresql", "k8s"/"kubernetes").
+    """
+    resume_terms = sorted(set([kw.lower() for kw in resume_keywords]))
+    jd_terms = sorted(set([kw.lower() for kw in jd_keywords]))
+
+    if resume_terms and jd_terms:
+        best = similarity_matrix(resume_terms, jd_terms, vectorizer).max(axis=0)
+        # Tolerance so identical keywords still match at threshold=1.0
+        covered = best >= threshold - 1e-6
+    else:
+        covered = np.zeros(len(jd_terms), dtype=bool)
+
+    matched_keywords = {kw for kw, hit in zip(jd_terms, covered) if hit}
+    missing_keywords = [kw for kw, hit in zip(jd_terms, covered) if not hit]
+
+    match_score = round(len(matched_keywords) / max(len(jd_terms), 1) * 100, 2)
+
+    category_breakdown = {
+        category: category_score(matched_keywords, keywords)
+        for category, keywords in CATEGORY_KEYWORDS.items()
+    }
+
+    return match_score, missing_keywords, category_breakdown
+
+
+def semantic_match_matrix(
+    resume_keyword_lists: Sequence[List[str]],
+    jd_keyword_lists: Sequence[List[str]],
+    threshold: float = SEMANTIC_THRESHOLD,
+    vectorizer: Optional[KeywordVectorizer] = None
+) -> np.ndarray:
+    """
+    Semantic match score of every resume against every JD. Keyword
+    similarities are computed once over the distinct keywords, in row
+    blocks, and per-document coverage comes from sparse matrix products.
+    """
+    from utils.batch_scorer import KeywordVocabulary, rounded_percent, build_keyword_matrix
+
+    vectorizer = vectorizer or get_vectorizer()
+    resume_sets = [set([kw.lower() for kw in kws]) for kws in resume_keyword_lists]
+    jd_sets = [set([kw.lower() for kw in kws]) for kws in jd_keyword_lists]
+
+    resume_vocab, jd_vocab = KeywordVocabulary(), KeywordVocabulary()
+    resume_matrix = build_keyword_matrix([resume_vocab.intern_all(s) for s in resume_sets], len(resume_vocab))
+    jd_matrix = build_keyword_matrix([jd_vocab.intern_all(s) for s in jd_sets], len(jd_vocab))
+
+    # Thresholded resume-term x JD-term match matrix
+    jd_vectors = vectorizer.matrix(jd_vocab.terms)
+    blocks = []
+    for start in range(0, len(resume_vocab), SIMILARITY_BLOCK_ROWS):
+        block = vectorizer.matrix(resume_vocab.terms[start:start + SIMILARITY_BLOCK_ROWS]) @ jd_vectors.T
+        blocks.append(sparse.csr_matrix(block >= threshold - 1e-6, dtype=np.int32))
+    term_matches = sparse.vstack(blocks).tocsr() if blocks else sparse.csr_matrix((0, len(jd_vocab)), dtype=np.int32)
+
+    # Which JD terms each resume covers, then how many of each JD's terms that is
+    covered = (resume_matrix @ term_matches).astype(bool).astype(np.int32)
+    overlap = np.asarray((covered @ jd_matrix.T).todense(), dtype=np.int64)
+
+    jd_sizes = np.array([len(s) for s in jd_sets], dtype=np.int64)
+    return rounded_percent(overlap, np.maximum(jd_sizes, 1)[np.newaxis, :])
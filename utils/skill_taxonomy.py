@@ -0,0 +1,177 @@
+import csv
+import json
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skills_taxonomy.json"),
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text.lower())
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher: after build(), iter_matches scans a text
+    once and reports every occurrence of every pattern, in time linear in the
+    text length plus the number of matches, regardless of how many patterns
+    there are.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._lengths: List[int] = []
+
+    def add(self, pattern: str) -> int:
+        """
+        Adds a pattern and returns its id.
+        """
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        pattern_id = len(self._lengths)
+        self._lengths.append(len(pattern))
+        self._out[state] = self._out[state] + (pattern_id,)
+        return pattern_id
+
+    def build(self) -> "AhoCorasick":
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields (start, end, pattern_id) for every occurrence, end exclusive.
+        """
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in out[state]:
+                yield index + 1 - lengths[pattern_id], index + 1, pattern_id
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills with aliases and a category each, compiled into one
+    Aho-Corasick automaton over all names and aliases.
+    """
+
+    def __init__(self, skills: List[dict]):
+        self.categories: List[str] = []
+        self.skill_category: Dict[str, str] = {}
+        # Every name and alias phrase -> canonical skill name
+        self.aliases: Dict[str, str] = {}
+        self._automaton = AhoCorasick()
+        self._pattern_skill: List[str] = []
+
+        for entry in skills:
+            name = normalize_text(entry["name"]).strip()
+            category = entry.get("category", "Other")
+            if category not in self.categories:
+                self.categories.append(category)
+            self.skill_category[name] = category
+            for phrase in [name] + list(entry.get("aliases", [])):
+                phrase = normalize_text(phrase).strip()
+                if phrase:
+                    self.aliases[phrase] = name
+                    self._automaton.add(phrase)
+                    self._pattern_skill.append(name)
+        self._automaton.build()
+
+    def __len__(self) -> int:
+        return len(self.skill_category)
+
+    def find_skills(self, text: str) -> Set[str]:
+        """
+        Canonical names of every taxonomy skill mentioned in the raw text.
+        Matches must start and end on a word boundary, so "java" is not
+        found inside "javascript", and a match nested inside a longer one
+        is ignored.
+        """
+        normalized = normalize_text(text)
+        spans = []
+        for start, end, pattern_id in self._automaton.iter_matches(normalized):
+            if start > 0 and normalized[start - 1].isalnum():
+                continue
+            if end < len(normalized) and normalized[end].isalnum():
+                continue
+            spans.append((start, -end, pattern_id))
+
+        # Drop matches nested in a longer one ("ci" and "cd" inside "ci/cd")
+        found = set()
+        covered_until = -1
+        for start, neg_end, pattern_id in sorted(spans):
+            if -neg_end <= covered_until:
+                continue
+            covered_until = -neg_end
+            found.add(self._pattern_skill[pattern_id])
+        return found
+
+    def category_of(self, skill: str) -> Optional[str]:
+        return self.skill_category.get(skill)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        """
+        Loads a JSON taxonomy ({"skills": [{name, category, aliases}]}) or a
+        CSV with name,category,aliases columns (aliases separated by "|").
+        """
+        if path.lower().endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                skills = [
+                    {
+                        "name": row["name"],
+                        "category": row.get("category") or "Other",
+                        "aliases": [a for a in (row.get("aliases") or "").split("|") if a],
+                    }
+                    for row in csv.DictReader(f)
+                ]
+        else:
+            with open(path, encoding="utf-8") as f:
+                skills = json.load(f)["skills"]
+        return cls(skills)
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """
+    Loads and compiles the default taxonomy once per process.
+    """
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.from_file(DEFAULT_TAXONOMY_PATH)
+    return _taxonomy
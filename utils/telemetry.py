@@ -0,0 +1,302 @@
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+TELEMETRY_ENABLED = os.getenv("TELEMETRY_DISABLED", "0") != "1"
+TRACE_DIR = os.getenv("TRACE_DIR")
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Tuple], float] = {}
+_histograms: Dict[Tuple[str, Tuple], List] = {}
+_collectors: List[Callable[[], List[Tuple[str, dict, float]]]] = []
+
+# Spans recorded during the current traced request, if any
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+
+_NOOP = contextlib.nullcontext()
+
+
+def set_enabled(enabled: bool) -> None:
+    global TELEMETRY_ENABLED
+    TELEMETRY_ENABLED = enabled
+
+
+def _key(name: str, labels: dict) -> Tuple[str, Tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def increment(name: str, value: float = 1, **labels) -> None:
+    if not TELEMETRY_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """
+    Adds a sample to a histogram (count, sum and cumulative bucket counts).
+    """
+    if not TELEMETRY_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0, 0.0, [0] * len(DURATION_BUCKETS)]
+        hist[0] += 1
+        hist[1] += value
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                hist[2][i] += 1
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "start")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        observe("pipeline_stage_seconds", duration, stage=self.name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace["spans"].append({
+                "name": self.name,
+                "start_ms": round((self.start - trace["_t0"]) * 1000, 3),
+                "duration_ms": round(duration * 1000, 3),
+                "error": exc_type.__name__ if exc_type else None,
+                **self.attrs,
+            })
+        return False
+
+
+def span(name: str, **attrs):
+    """
+    Times a block as stage `name`. Returns a shared no-op context when
+    telemetry is disabled.
+    """
+    if not TELEMETRY_ENABLED:
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def traced(name: str):
+    """
+    Decorator form of span() for plain (non-generator) functions.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TELEMETRY_ENABLED:
+                return fn(*args, **kwargs)
+            with _Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_token_usage(call_site: str, usage) -> None:
+    """
+    Adds the prompt/completion token counts from a completion response's `usage`.
+    """
+    if usage is None or not TELEMETRY_ENABLED:
+        return
+    increment("llm_prompt_tokens_total", getattr(usage, "prompt_tokens", 0) or 0, call_site=call_site)
+    increment("llm_completion_tokens_total", getattr(usage, "completion_tokens", 0) or 0, call_site=call_site)
+
+
+def register_collector(collector: Callable[[], List[Tuple[str, dict, float]]]) -> None:
+    """
+    Registers a callable returning (metric_name, labels, value) gauges that are
+    read at export time, e.g. cache hit counters kept elsewhere.
+    """
+    _collectors.append(collector)
+
+
+@contextlib.contextmanager
+def trace_request(request_id: Optional[str] = None, dump_dir: Optional[str] = TRACE_DIR):
+    """
+    Collects every span inside the block into one trace. The trace dict is
+    yielded and, when dump_dir is set, written there as <request_id>.json.
+    """
+    trace = {"request_id": request_id or uuid.uuid4().hex, "spans": [], "_t0": time.perf_counter()}
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace["total_ms"] = round((time.perf_counter() - trace.pop("_t0")) * 1000, 3)
+        if dump_dir:
+            os.makedirs(dump_dir, exist_ok=True)
+            with open(os.path.join(dump_dir, f"{trace['request_id']}.json"), "w", encoding="utf-8") as f:
+                json.dump(trace, f, indent=2)
+
+
+@contextlib.contextmanager
+def profile_request(output_dir: Optional[str] = PROFILE_DIR, name: Optional[str] = None):
+    """
+    Profiles the block when output_dir is set: pyinstrument's HTML report if
+    it is installed, otherwise a cProfile .prof file. A no-op otherwise.
+    """
+    if not output_dir:
+        yield None
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    name = name or time.strftime("%Y%m%d-%H%M%S")
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+
+    if Profiler is not None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            with open(os.path.join(output_dir, f"{name}.html"), "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+    else:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(output_dir, f"{name}.prof"))
+
+
+def _collected() -> List[Tuple[str, dict, float]]:
+    gauges = []
+    for collector in list(_collectors):
+        try:
+            gauges.extend(collector())
+        except Exception as e:
+            print(f"Metrics collector error: {e}")
+    return gauges
+
+
+def metrics_json() -> dict:
+    with _lock:
+        counters = [{"name": n, "labels": dict(l), "value": v} for (n, l), v in _counters.items()]
+        histograms = [
+            {
+                "name": n,
+                "labels": dict(l),
+                "count": h[0],
+                "sum": h[1],
+                "buckets": dict(zip([str(b) for b in DURATION_BUCKETS], h[2])),
+            }
+            for (n, l), h in _histograms.items()
+        ]
+    gauges = [{"name": n, "labels": labels, "value": v} for n, labels, v in _collected()]
+    return {"counters": counters, "histograms": histograms, "gauges": gauges}
+
+
+def _escape_label_value(value) -> str:
+    # The exposition format escapes exactly these three in label values
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in sorted(labels.items()))
+    return "{" + body + "}"
+
+
+def render_prometheus() -> str:
+    """
+    Renders all metrics in the Prometheus text exposition format.
+    """
+    data = metrics_json()
+    # Samples of one metric must be contiguous in the exposition format
+    for kind in ("counters", "histograms", "gauges"):
+        data[kind].sort(key=lambda m: m["name"])
+    lines = []
+    typed = set()
+
+    def declare(name: str, kind: str):
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for c in data["counters"]:
+        declare(c["name"], "counter")
+        lines.append(f"{c['name']}{_labels(c['labels'])} {c['value']}")
+    for h in data["histograms"]:
+        declare(h["name"], "histogram")
+        for bound, count in h["buckets"].items():
+            lines.append(f"{h['name']}_bucket{_labels(dict(h['labels'], le=bound))} {count}")
+        lines.append(f"{h['name']}_bucket{_labels(dict(h['labels'], le='+Inf'))} {h['count']}")
+        lines.append(f"{h['name']}_count{_labels(h['labels'])} {h['count']}")
+        lines.append(f"{h['name']}_sum{_labels(h['labels'])} {h['sum']}")
+    for g in data["gauges"]:
+        declare(g["name"], "gauge")
+        lines.append(f"{g['name']}{_labels(g['labels'])} {g['value']}")
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/metrics.json"):
+            body, content_type = json.dumps(metrics_json()).encode("utf-8"), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, content_type = render_prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0"):
+    """
+    Serves /metrics (Prometheus text) and /metrics.json from a daemon thread.
+    Safe to call repeatedly; only the first call starts a server.
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
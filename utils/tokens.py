@@ -0,0 +1,64 @@
+import re
+import threading
+from typing import List
+
+from utils.constants import DEFAULT_MODEL
+
+# Per-message framing tokens added by the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Roughly one BPE token per 4 characters of a word, one per punctuation mark
+_PIECES = re.compile(r"\w{1,4}|[^\w\s]")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.encoding_for_model(DEFAULT_MODEL)
+                except Exception:
+                    # tiktoken is optional (and needs its BPE files); fall back to the estimate
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts tokens locally: exactly with tiktoken when it is installed,
+    otherwise with a close character-based estimate.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(_PIECES.findall(text))
+
+
+def count_message_tokens(messages: List[dict]) -> int:
+    return sum(count_tokens(m.get("content") or "") + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cuts text to at most max_tokens, on a word boundary where possible.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text)[:max_tokens])
+    else:
+        pieces = list(_PIECES.finditer(text))
+        cut = text[:pieces[max_tokens - 1].end()] if max_tokens > 0 else ""
+    if " " in cut:
+        cut = cut[:cut.rfind(" ")]
+    return cut.rstrip() + " …"